@@ -0,0 +1,150 @@
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+from sqlalchemy import create_engine, event, insert, select, text
+
+import database
+import models
+
+'''
+Benchmarks the calendar range queries (/calendar/today/ and
+/calendar/month/) on eventlist tables of 10k, 100k and 1M events spread
+over ten years, with and without the index on EventList.date, and
+prints the SQLite query plan of each.
+
+Every size gets its own temporary database with the same pragmas as
+dash.db (see database.SQLITE_PRAGMAS).
+
+Examples:
+    python benchmark-eventRange.py
+    python benchmark-eventRange.py --sizes 10000,100000 --repeat 50 --json range.json
+'''
+
+INDEX_NAME = "ix_eventlist_date"
+
+
+def fillEvents(engine, count, start, span, batch=50000) -> None:
+    """
+    Inserts count events with random dates in [start, start + span).
+    """
+    rng = random.Random(count)
+    spanSeconds = span.total_seconds()
+    with engine.begin() as connection:
+        for first in range(0, count, batch):
+            rows = [
+                {
+                    'title': f"event {i}",
+                    'desc': "",
+                    'link': "",
+                    'date': start + timedelta(seconds=rng.random() * spanSeconds),
+                }
+                for i in range(first, min(count, first + batch))
+            ]
+            connection.execute(insert(models.EventList), rows)
+
+
+def timeQuery(engine, query, repeat) -> dict:
+    """
+    :return: Dictionary of rows returned and p50/p95/mean latency in ms
+    """
+    samples = []
+    with engine.connect() as connection:
+        for _ in range(repeat):
+            begin = time.perf_counter()
+            rows = connection.execute(query).fetchall()
+            samples.append(time.perf_counter() - begin)
+
+    ms = np.array(samples) * 1000
+    return {
+        'rows': len(rows),
+        'mean_ms': round(float(ms.mean()), 3),
+        'p50_ms': round(float(np.percentile(ms, 50)), 3),
+        'p95_ms': round(float(np.percentile(ms, 95)), 3),
+    }
+
+
+def queryPlan(engine, query) -> str:
+    compiled = query.compile(engine, compile_kwargs={"literal_binds": True})
+    with engine.connect() as connection:
+        plan = connection.execute(text(f"EXPLAIN QUERY PLAN {compiled}")).fetchall()
+    return "; ".join(row[-1] for row in plan)
+
+
+def rangeQuery(start, end):
+    return select(models.EventList).where(
+        models.EventList.date >= start,
+        models.EventList.date < end,
+    )
+
+
+def runSize(count, repeat, directory) -> dict:
+    path = os.path.join(directory, f"events-{count}.db")
+    engine = create_engine(f"sqlite:///{path}")
+    event.listen(engine, "connect", database.set_sqlite_pragmas)
+    models.Base.metadata.create_all(bind=engine)
+
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    begin = time.perf_counter()
+    fillEvents(engine, count, now - timedelta(days=5 * 365), timedelta(days=10 * 365))
+    fillSeconds = time.perf_counter() - begin
+
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    month = today.replace(day=1)
+    queries = {
+        'today': rangeQuery(today, today + timedelta(days=1)),
+        'month': rangeQuery(month, (month + timedelta(days=32)).replace(day=1)),
+    }
+
+    result = {'events': count, 'fill_seconds': round(fillSeconds, 2)}
+    for indexed in (False, True):
+        with engine.begin() as connection:
+            connection.execute(text(f"DROP INDEX IF EXISTS {INDEX_NAME}"))
+            if indexed:
+                connection.execute(text(f"CREATE INDEX {INDEX_NAME} ON eventlist (date)"))
+                connection.execute(text("ANALYZE"))
+
+        label = "indexed" if indexed else "scan"
+        for name, query in queries.items():
+            stats = timeQuery(engine, query, repeat)
+            stats['plan'] = queryPlan(engine, query)
+            result[f"{name}_{label}"] = stats
+
+    engine.dispose()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Calendar range query benchmark")
+    parser.add_argument("--sizes", type=lambda v: [int(x) for x in v.split(",")], default=[10000, 100000, 1000000])
+    parser.add_argument("--repeat", type=int, default=20, help="timed runs of each query")
+    parser.add_argument("--json", help="also write the results to this file")
+    options = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for count in options.sizes:
+            result = runSize(count, options.repeat, directory)
+            results.append(result)
+
+            print(f"{count} events (filled in {result['fill_seconds']} s)")
+            print(f"  {'query':<16}{'rows':>8}{'p50':>10}{'p95':>10}  (ms)  plan")
+            for key in ("today_scan", "today_indexed", "month_scan", "month_indexed"):
+                stats = result[key]
+                print(
+                    f"  {key:<16}{stats['rows']:>8}{stats['p50_ms']:>10.3f}"
+                    f"{stats['p95_ms']:>10.3f}        {stats['plan']}"
+                )
+
+    if options.json:
+        with open(options.json, "w") as output:
+            json.dump(results, output, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,263 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import handTrackingModule as htm
+import gestureEngineModule as gem
+import frameSourceModule as fsm
+
+'''
+Benchmarks the gesture pipeline over a recorded clip (video file, image
+directory or landmark log, see frameSourceModule) and reports frames
+per second plus p50/p95/p99 latency of each stage:
+
+    capture     reading the next frame from the source
+    preprocess  framePreprocessor flip, brightness and RGB conversion
+    inference   Mediapipe Hands.process on the region of interest
+    landmarks   converting Mediapipe results to the landmark array
+    gesture     the gesture engine (or findDistance + setCursorState)
+    encode      serializing the websocket message
+
+--legacy times the pre-engine path instead: find2Hands (inference and
+landmarks together), then findDistance and setCursorState.
+--ws replays the clip through the real /ws endpoint of main.py and
+reports capture-to-receive latency as the "websocket" stage. The server
+always replays recordings in real time, so --pacing does not apply.
+
+Examples:
+    python benchmark-gesturePipeline.py clip.mp4
+    python benchmark-gesturePipeline.py frames/ --frames 300 --json bench.json
+    python benchmark-gesturePipeline.py clip.mp4 --ws --frames 300
+    python benchmark-gesturePipeline.py clip.mp4 --backend tasks --model-path hand_landmarker.task
+'''
+
+
+class stageTimer:
+    """
+    Collects per-stage latency samples and summarizes them.
+    """
+
+    def __init__(self):
+        self.samples = {}
+
+    def add(self, stage, seconds) -> None:
+        self.samples.setdefault(stage, []).append(seconds)
+
+    def summary(self) -> dict:
+        """
+        :return: Dictionary of stage to count, mean, p50, p95, p99 and max in ms
+        """
+        result = {}
+        for stage, samples in self.samples.items():
+            ms = np.array(samples) * 1000
+            p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+            result[stage] = {
+                'count': len(ms),
+                'mean_ms': round(float(ms.mean()), 3),
+                'p50_ms': round(float(p50), 3),
+                'p95_ms': round(float(p95), 3),
+                'p99_ms': round(float(p99), 3),
+                'max_ms': round(float(ms.max()), 3),
+            }
+        return result
+
+
+def runPipeline(source, timer, maxFrames, options) -> int:
+    """
+    Drives the server pipeline stage by stage, timing each one.
+
+    :return: Int number of frames processed
+    """
+    detector = htm.handDetector(
+        modelComplexity=options.model_complexity,
+        minDetectionConf=0.55,
+        roi=options.roi,
+        roiScale=options.roi_scale,
+        backend=options.backend,
+        runningMode=options.running_mode,
+        modelPath=options.model_path,
+        headless=True,
+    )
+    preprocessor = htm.framePreprocessor(brightness=1.2)
+    engine = gem.buildEngine(options.recognizers)
+
+    frames = 0
+    while frames < maxFrames:
+        start = time.perf_counter()
+        frame = source.read()
+        if frame is None:
+            break
+        timer.add("capture", time.perf_counter() - start)
+
+        landmarks = frame.landmarks
+        if landmarks is None:
+            start = time.perf_counter()
+            image, rgb = preprocessor.process(frame.image)
+            timer.add("preprocess", time.perf_counter() - start)
+
+            start = time.perf_counter()
+            results = detector.processRoi(image, rgb, frame.index)
+            timer.add("inference", time.perf_counter() - start)
+            if results is None:
+                # live_stream result still pending, the engine has nothing new
+                frames += 1
+                continue
+
+            start = time.perf_counter()
+            landmarks = detector.extractLandmarks(*results)
+            timer.add("landmarks", time.perf_counter() - start)
+
+        start = time.perf_counter()
+        events = engine.process(landmarks, frame.timestamp)
+        timer.add("gesture", time.perf_counter() - start)
+
+        start = time.perf_counter()
+        gesture = events[0]['gesture'] if events else "none"
+        json.dumps({'gesture': gesture, 'seq': frames, 'ts': frame.timestamp})
+        timer.add("encode", time.perf_counter() - start)
+
+        frames += 1
+    return frames
+
+
+def runLegacy(source, timer, maxFrames, options) -> int:
+    """
+    Drives the pre-engine path: find2Hands, findDistance, setCursorState.
+
+    :return: Int number of frames processed
+    """
+    detector = htm.handDetector(modelComplexity=options.model_complexity, minDetectionConf=0.55)
+    preprocessor = htm.framePreprocessor(brightness=1.2)
+
+    frames = 0
+    while frames < maxFrames:
+        start = time.perf_counter()
+        frame = source.read()
+        if frame is None:
+            break
+        if frame.image is None:
+            sys.exit("--legacy needs a video or image source, not a landmark log")
+        timer.add("capture", time.perf_counter() - start)
+
+        start = time.perf_counter()
+        image, rgb = preprocessor.process(frame.image)
+        timer.add("preprocess", time.perf_counter() - start)
+
+        start = time.perf_counter()
+        lmBothList, bb = detector.find2Hands(image, draw=False, rgb=rgb, frameId=frames)
+        timer.add("find2Hands", time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for lmList in lmBothList:
+            if lmList and detector.isLeft(lmList):
+                gap_length, center_x, center_y = detector.findDistance(image, lmList, 1, 3, False)
+                if center_y < 160:
+                    detector.setCursorState(gap_length, center_x, center_y)
+                    break
+        gesture = detector.getCursorGesture()
+        timer.add("gesture", time.perf_counter() - start)
+
+        start = time.perf_counter()
+        json.dumps({'gesture': gesture})
+        timer.add("encode", time.perf_counter() - start)
+
+        frames += 1
+    return frames
+
+
+def runWebsocket(spec, timer, maxFrames, options) -> int:
+    """
+    Replays the clip through main.py's /ws endpoint in stream mode and
+    times each message from capture to receipt by the client.
+
+    :return: Int number of messages received
+    """
+    # The server reads its gesture configuration when main is imported
+    os.environ["GESTURE_SOURCE"] = spec
+    os.environ["GESTURE_MODEL_COMPLEXITY"] = str(options.model_complexity)
+    os.environ["GESTURE_BACKEND"] = options.backend
+    os.environ["GESTURE_HAND_MODEL"] = options.model_path
+    from fastapi.testclient import TestClient
+    from starlette.websockets import WebSocketDisconnect
+    import main
+
+    frames = 0
+    with TestClient(main.app) as client:
+        with client.websocket_connect("/ws?mode=stream") as websocket:
+            while frames < maxFrames:
+                try:
+                    message = json.loads(websocket.receive_text())
+                except WebSocketDisconnect:
+                    # The server closes the socket once the clip ends
+                    break
+                timer.add("websocket", time.time() - message['ts'])
+                frames += 1
+    return frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gesture pipeline benchmark")
+    parser.add_argument("source", help="video file, image directory or landmark log")
+    parser.add_argument("--frames", type=int, default=1000, help="stop after this many frames")
+    parser.add_argument("--pacing", choices=("fast", "realtime"), default=None, help="fast by default, not with --ws")
+    parser.add_argument("--model-complexity", type=int, default=1)
+    parser.add_argument("--roi", type=lambda v: tuple(float(x) for x in v.split(",")), default=None)
+    parser.add_argument("--roi-scale", type=float, default=1.0)
+    parser.add_argument("--backend", choices=("solutions", "tasks"), default="solutions")
+    parser.add_argument("--running-mode", choices=("video", "live_stream"), default="video",
+                        help="tasks backend only, live_stream times submission, not inference")
+    parser.add_argument("--model-path", default="hand_landmarker.task", help="tasks backend model")
+    parser.add_argument("--recognizers", type=lambda v: tuple(v.split(",")), default=("pinch",))
+    parser.add_argument("--legacy", action="store_true", help="time find2Hands/findDistance/setCursorState")
+    parser.add_argument("--ws", action="store_true", help="time the /ws endpoint end to end")
+    parser.add_argument("--json", help="also write the results to this file")
+    options = parser.parse_args()
+    if options.ws and options.pacing is not None:
+        parser.error("--pacing does not apply to --ws, the server replays recordings in real time")
+    options.pacing = "realtime" if options.ws else options.pacing or "fast"
+
+    timer = stageTimer()
+    start = time.perf_counter()
+
+    if options.ws:
+        mode = "websocket"
+        frames = runWebsocket(options.source, timer, options.frames, options)
+    else:
+        mode = "legacy" if options.legacy else "pipeline"
+        run = runLegacy if options.legacy else runPipeline
+        with fsm.openSource(options.source, pacing=options.pacing) as source:
+            frames = run(source, timer, options.frames, options)
+
+    elapsed = time.perf_counter() - start
+    result = {
+        'source': options.source,
+        'mode': mode,
+        'pacing': options.pacing,
+        'model_complexity': options.model_complexity,
+        'roi': options.roi,
+        'roi_scale': options.roi_scale,
+        'backend': options.backend,
+        'frames': frames,
+        'seconds': round(elapsed, 3),
+        'fps': round(frames / elapsed, 2) if elapsed > 0 else 0.0,
+        'stages': timer.summary(),
+    }
+
+    print(f"{mode}: {frames} frames in {result['seconds']} s, {result['fps']} fps")
+    print(f"{'stage':<12}{'mean':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}  (ms)")
+    for stage, stats in result['stages'].items():
+        print(
+            f"{stage:<12}{stats['mean_ms']:>9.2f}{stats['p50_ms']:>9.2f}"
+            f"{stats['p95_ms']:>9.2f}{stats['p99_ms']:>9.2f}{stats['max_ms']:>9.2f}"
+        )
+
+    if options.json:
+        with open(options.json, "w") as output:
+            json.dump(result, output, indent=2)
+
+
+if __name__ == '__main__':
+    main()
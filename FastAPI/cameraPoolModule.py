@@ -0,0 +1,176 @@
+import multiprocessing as mp
+import threading
+
+import gestureStreamModule as gsm
+import frameSourceModule as fsm
+import frameRingModule as frm
+
+'''
+This module runs gesture pipelines in worker processes instead of
+threads, so MediaPipe inference for several cameras scales across cores
+instead of being serialized under one GIL. Each processWorker spawns a
+process that owns one frame source, its own handDetector and gesture
+engine, and streams the compact gesture messages (small dictionaries,
+never frames) back over a one-way pipe. A reader thread in the FastAPI
+process forwards them to the event loop.
+
+With sharedCapture the camera stays in the FastAPI process instead: a
+capture thread writes every frame into a frm.sharedFrameRing and the
+worker process reads the newest one straight from shared memory, so
+frames cross the process boundary without being pickled or queued.
+
+processWorker has the same interface as gsm.gestureWorker, so it is
+selected with gsm.gestureBroadcaster(workerClass=processWorker, ...).
+'''
+
+# Spawn rather than fork, the FastAPI process already runs threads
+context = mp.get_context("spawn")
+
+
+def runPipelineProcess(pipelineOptions, conn, stopEvent) -> None:
+    """
+    Entry point of a worker process. Runs a gesturePipeline and sends
+    every message, then None, down conn.
+    """
+    pipeline = gsm.gesturePipeline(**pipelineOptions)
+
+    def publish(message):
+        try:
+            conn.send(message)
+        except (BrokenPipeError, EOFError, OSError):
+            # The FastAPI process went away
+            stopEvent.set()
+
+    try:
+        pipeline.run(publish, stopEvent)
+    finally:
+        conn.close()
+
+
+class processWorker:
+    """
+    Runs a gesturePipeline in its own process and publishes
+    gesture results back to the event loop.
+    """
+
+    def __init__(self, loop, deliver, sharedCapture=False, ringSlots=4, **pipelineOptions):
+        """
+        processWorker constructor.
+
+        :param: loop, the running asyncio event loop deliver runs on
+        :param: deliver, callback run on the event loop with each message
+        :param: sharedCapture, read the source in this process and share
+        frames through a frm.sharedFrameRing
+        :param: ringSlots, frames kept in the ring
+        :param: pipelineOptions, keyword arguments passed to gesturePipeline
+        """
+        self.loop = loop
+        self.deliver = deliver
+        self.sharedCapture = sharedCapture
+        self.ringSlots = ringSlots
+        self.pipelineOptions = pipelineOptions
+        self.stopEvent = context.Event()
+        self.conn, self.childConn = context.Pipe(duplex=False)
+        self.process = None
+        self.ring = None
+        self.capture = threading.Thread(target=self.captureFrames, daemon=True)
+        self.reader = threading.Thread(target=self.readMessages, daemon=True)
+
+    def start(self) -> None:
+        self.reader.start()
+        if self.sharedCapture:
+            # The ring is sized from the first frame, so the capture thread starts the process
+            self.capture.start()
+        else:
+            self.startProcess(self.pipelineOptions)
+
+    def startProcess(self, pipelineOptions) -> None:
+        self.process = context.Process(
+            target=runPipelineProcess,
+            args=(pipelineOptions, self.childConn, self.stopEvent),
+            daemon=True,
+        )
+        self.process.start()
+        # Only the child writes, so EOF arrives when it exits
+        self.childConn.close()
+
+    def captureFrames(self) -> None:
+        """
+        Capture thread of sharedCapture, writes frames into the ring until
+        stopped or the source ends. The ring is freed here once the process
+        is done with it, so a source that ends by itself does not leak it.
+        """
+        source = None
+        try:
+            source = fsm.openSource(
+                self.pipelineOptions.get('source', 0),
+                loop=self.pipelineOptions.get('sourceLoop', False),
+            )
+            frame = source.read()
+            if frame is None or frame.image is None:
+                raise ValueError("sharedCapture needs a camera or video source")
+
+            self.ring = frm.sharedFrameRing(frame.image.shape, self.ringSlots)
+            self.startProcess({**self.pipelineOptions, 'source': self.ring, 'sourceLoop': False})
+
+            while frame is not None and not self.stopEvent.is_set():
+                self.ring.write(frame.image, frame.timestamp)
+                frame = source.read()
+        finally:
+            if self.ring is not None:
+                self.ring.closeWriter()
+            if source is not None:
+                source.release()
+            if self.process is None:
+                # Nothing will ever write, let the reader see EOF
+                self.childConn.close()
+            else:
+                # Reads the closed ring to its end, or is terminated by join
+                self.process.join()
+            if self.ring is not None:
+                self.ring.close()
+
+    def stop(self) -> None:
+        """
+        Asks the process to finish its current frame and release the camera.
+        """
+        self.stopEvent.set()
+
+    def join(self, timeout=5.0) -> None:
+        """
+        Waits for the process, terminating it if it does not stop in time.
+        """
+        if self.capture.is_alive():
+            self.capture.join(timeout)
+        if self.process is not None:
+            self.process.join(timeout)
+            if self.process.is_alive():
+                self.process.terminate()
+                self.process.join()
+        if self.capture.is_alive():
+            # Frees the ring now that the process is gone
+            self.capture.join()
+        self.reader.join()
+
+    def publish(self, message) -> None:
+        try:
+            self.loop.call_soon_threadsafe(self.deliver, message)
+        except RuntimeError:
+            # The event loop is already closed, nobody is listening
+            self.stopEvent.set()
+
+    def readMessages(self) -> None:
+        """
+        Reader thread, forwards messages from the process to the event loop.
+        """
+        try:
+            while True:
+                message = self.conn.recv()
+                self.publish(message)
+                if message is None:
+                    return
+        except (EOFError, OSError):
+            # The process died without saying goodbye
+            self.publish(None)
+        finally:
+            self.conn.close()
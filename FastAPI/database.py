@@ -1,11 +1,70 @@
-from sqlalchemy import create_engine
+import os
+
+from dotenv import load_dotenv
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 
+# main imports this module before it loads .env, the settings below need it now
+load_dotenv()
+
 URL_DATABASE = 'sqlite:///./dash.db'
+# Same database through aiosqlite, used by the FastAPI endpoints so
+# queries never block the event loop serving the websockets
+ASYNC_URL_DATABASE = 'sqlite+aiosqlite:///./dash.db'
+
+'''
+SQLite settings applied to every new connection. WAL lets dashboard
+reads run while a task or event is written, synchronous=NORMAL is safe
+with WAL and skips an fsync per commit, mmap_size and cache_size
+(negative means KiB) keep hot pages in memory, and busy_timeout (ms)
+makes a writer wait for a lock instead of failing.
+'''
+SQLITE_PRAGMAS = {
+    'journal_mode': os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+    'synchronous': os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+    'mmap_size': int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+    'cache_size': int(os.getenv("SQLITE_CACHE_SIZE", "-20000")),
+    'busy_timeout': int(os.getenv("SQLITE_BUSY_TIMEOUT", "5000")),
+}
+
+# Connections kept open per engine, and how many more may be opened under load
+POOL_OPTIONS = {
+    'pool_size': int(os.getenv("DB_POOL_SIZE", "5")),
+    'max_overflow': int(os.getenv("DB_MAX_OVERFLOW", "10")),
+    'pool_timeout': float(os.getenv("DB_POOL_TIMEOUT", "30")),
+}
+
+
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    for name, value in SQLITE_PRAGMAS.items():
+        cursor.execute(f"PRAGMA {name}={value}")
+    cursor.close()
 
-engine = create_engine(URL_DATABASE, connect_args={"check_same_thread": False})
+
+# Synchronous engine for scripts and table creation
+engine = create_engine(URL_DATABASE, connect_args={"check_same_thread": False}, **POOL_OPTIONS)
+event.listen(engine, "connect", set_sqlite_pragmas)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+async_engine = create_async_engine(ASYNC_URL_DATABASE, **POOL_OPTIONS)
+event.listen(async_engine.sync_engine, "connect", set_sqlite_pragmas)
+
+# Objects stay readable after commit, endpoints return them as responses
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
+
+
+def create_missing_indexes(metadata, bind=engine):
+    """
+    create_all only creates indexes together with their table, this
+    adds indexes declared since to tables of an existing database
+    (CREATE INDEX IF NOT EXISTS).
+    """
+    for table in metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=bind, checkfirst=True)
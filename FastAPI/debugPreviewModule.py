@@ -0,0 +1,151 @@
+import multiprocessing as mp
+import queue
+import threading
+import time
+
+import cv2 as cv
+import numpy as np
+import handTrackingModule as htm
+
+'''
+This module lets someone look at what the gesture pipeline sees without
+opening the camera a second time. A previewFeed is handed to a
+gesturePipeline, which offers it each preprocessed frame along with the
+landmarks of the cached detection. The feed does nothing while nobody
+is watching; with a viewer it downsizes, overlays and JPEG-encodes at
+most maxFps frames per second, independently of the inference rate.
+
+The watcher count and the encoded frames cross process boundaries, so
+the same feed works for a pipeline in a gestureWorker thread or in a
+cameraPoolModule process. Viewers in the FastAPI process share the
+frames through waitFrame, every viewer sees every preview frame.
+'''
+
+# Spawn context, a feed may be passed to a cameraPoolModule process
+context = mp.get_context("spawn")
+
+
+class previewFeed:
+    """
+    On-demand JPEG preview of one gesture pipeline.
+    """
+
+    def __init__(self, maxFps=10.0, maxWidth=640, quality=70):
+        """
+        previewFeed constructor.
+
+        :param: maxFps, preview frames encoded per second at most
+        :param: maxWidth, frames wider than this are downsized first
+        :param: quality, JPEG quality, 0 to 100
+        """
+        self.maxFps = maxFps
+        self.maxWidth = maxWidth
+        self.quality = quality
+        self.watchers = context.Value("i", 0)
+        self.frames = context.Queue(maxsize=2)
+        self.initLocal()
+
+    def initLocal(self) -> None:
+        # Producer side
+        self.lastOffer = 0.0
+        self.small = None
+        self.annotated = None
+        # Viewer side
+        self.condition = threading.Condition()
+        self.pulling = False
+        self.seq = 0
+        self.jpeg = None
+
+    def __getstate__(self):
+        return {
+            'maxFps': self.maxFps,
+            'maxWidth': self.maxWidth,
+            'quality': self.quality,
+            'watchers': self.watchers,
+            'frames': self.frames,
+        }
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.initLocal()
+
+    def isWatched(self) -> bool:
+        return self.watchers.value > 0
+
+    def watch(self) -> None:
+        with self.watchers.get_lock():
+            self.watchers.value += 1
+
+    def unwatch(self) -> None:
+        with self.watchers.get_lock():
+            self.watchers.value = max(0, self.watchers.value - 1)
+
+    def offer(self, frame, landmarks, now=None) -> None:
+        """
+        Called by the pipeline with every processed frame. Encodes it
+        only when someone is watching and the preview rate allows it.
+
+        :param: frame, BGR frame the landmarks were detected on, only read
+        :param: landmarks, handLandmarks in frame pixels, None before any detection
+        """
+        now = now or time.time()
+        if not self.isWatched() or now - self.lastOffer < 1.0 / self.maxFps:
+            return
+        self.lastOffer = now
+        if landmarks is None:
+            landmarks = htm.handLandmarks(np.empty((0, 21, 3), np.float32), [], np.empty(0, np.float32))
+
+        height, width = frame.shape[:2]
+        scale = min(1.0, self.maxWidth / width)
+        if scale < 1.0:
+            size = (int(width * scale), int(height * scale))
+            if self.small is None or self.small.shape[:2] != (size[1], size[0]):
+                self.small = np.empty((size[1], size[0], frame.shape[2]), frame.dtype)
+            cv.resize(frame, size, dst=self.small, interpolation=cv.INTER_AREA)
+            frame = self.small
+            landmarks = htm.handLandmarks(landmarks.points * scale, landmarks.handedness, landmarks.scores)
+
+        self.annotated = htm.overlayFrame(frame, landmarks, out=self.annotated)
+        success, jpeg = cv.imencode(".jpg", self.annotated, [cv.IMWRITE_JPEG_QUALITY, self.quality])
+        if not success:
+            return
+
+        try:
+            self.frames.put_nowait(jpeg.tobytes())
+        except queue.Full:
+            # Viewers are behind, they get the next one
+            pass
+
+    def waitFrame(self, lastSeq, timeout=1.0):
+        """
+        Blocks until a preview frame newer than lastSeq exists. One viewer
+        thread pulls from the producer, the others wait for it.
+
+        :return: Tuple of Int sequence number and JPEG bytes, or lastSeq
+        and None when no frame arrived within timeout
+        """
+        with self.condition:
+            while self.seq <= lastSeq:
+                if self.pulling:
+                    if not self.condition.wait(timeout):
+                        return lastSeq, None
+                    continue
+
+                self.pulling = True
+                self.condition.release()
+                try:
+                    jpeg = self.frames.get(timeout=timeout)
+                except queue.Empty:
+                    jpeg = None
+                finally:
+                    self.condition.acquire()
+                    self.pulling = False
+
+                if jpeg is None:
+                    self.condition.notify_all()
+                    return lastSeq, None
+                self.seq += 1
+                self.jpeg = jpeg
+                self.condition.notify_all()
+
+            return self.seq, self.jpeg
@@ -0,0 +1,145 @@
+import multiprocessing as mp
+from multiprocessing import shared_memory
+
+import numpy as np
+
+'''
+This module moves frames between processes without pickling them.
+A sharedFrameRing is a fixed number of frame slots in one
+multiprocessing.shared_memory block, viewed as NumPy arrays on both
+sides. The writer always overwrites the oldest slot and readers only
+ever take the newest frame, so stale frames are dropped instead of
+queued and end-to-end latency stays bounded by one frame.
+
+Every slot carries the sequence number of the frame in it. A reader
+that works on a slot in place checks the sequence number again when it
+is done (isIntact) to detect that the writer lapped it in the meantime.
+
+Shared memory layout, all little endian:
+    int64 head                latest sequence number written, 0 for none
+    int64 closed              1 once the writer has finished
+    int64 seqs[slots]         sequence number held by each slot, -1 while written
+    float64 times[slots]      capture timestamp of each slot
+    frames[slots, *shape]     the frames
+'''
+
+
+class sharedFrameRing:
+    """
+    Ring of frames in shared memory, one writer and any number of readers.
+    Pass it to a spawned process as an argument, it reattaches by name.
+    """
+
+    def __init__(self, shape, slots=4, dtype=np.uint8, name=None, event=None):
+        """
+        sharedFrameRing constructor. Creates the shared memory block
+        unless name is given, in which case it attaches to it.
+
+        :param: shape, shape of one frame, e.g. (720, 1280, 3)
+        :param: slots, number of frames kept, at least 2
+        :param: dtype, NumPy dtype of the frames
+        :param: name, name of an existing block to attach to
+        :param: event, multiprocessing Event set on every write, created if None
+        """
+        self.shape = tuple(shape)
+        self.slots = max(2, slots)
+        self.dtype = np.dtype(dtype)
+        self.owner = name is None
+        self.event = event if event is not None else mp.get_context("spawn").Event()
+
+        headerBytes = 8 * (2 + 2 * self.slots)
+        frameBytes = int(np.prod(self.shape)) * self.dtype.itemsize
+        if self.owner:
+            self.memory = shared_memory.SharedMemory(create=True, size=headerBytes + self.slots * frameBytes)
+        else:
+            self.memory = shared_memory.SharedMemory(name=name)
+
+        buffer = self.memory.buf
+        self.header = np.ndarray((2,), np.int64, buffer, 0)
+        self.seqs = np.ndarray((self.slots,), np.int64, buffer, 16)
+        self.times = np.ndarray((self.slots,), np.float64, buffer, 16 + 8 * self.slots)
+        self.frames = np.ndarray((self.slots, *self.shape), self.dtype, buffer, headerBytes)
+
+        if self.owner:
+            self.header[:] = 0
+            self.seqs[:] = 0
+
+    def __reduce__(self):
+        return (sharedFrameRing, (self.shape, self.slots, self.dtype, self.memory.name, self.event))
+
+    @property
+    def name(self) -> str:
+        return self.memory.name
+
+    def write(self, frame, timestamp) -> int:
+        """
+        Copies frame into the oldest slot and publishes it.
+
+        :return: Int sequence number of the frame
+        """
+        seq = int(self.header[0]) + 1
+        slot = seq % self.slots
+
+        self.seqs[slot] = -1
+        np.copyto(self.frames[slot], frame)
+        self.times[slot] = timestamp
+        self.seqs[slot] = seq
+        self.header[0] = seq
+
+        self.event.set()
+        return seq
+
+    def closeWriter(self) -> None:
+        """
+        Tells readers no more frames are coming.
+        """
+        self.header[1] = 1
+        self.event.set()
+
+    def isClosed(self) -> bool:
+        return bool(self.header[1])
+
+    def latest(self, lastSeq=0, timeout=None):
+        """
+        Waits for a frame newer than lastSeq and returns a view of it,
+        without copying. Frames in between are skipped.
+
+        :return: Tuple of Int sequence number, Float timestamp and the
+        frame view, or None when the writer closed or timeout passed
+        """
+        while True:
+            seq = int(self.header[0])
+            if seq > lastSeq:
+                slot = seq % self.slots
+                timestamp = float(self.times[slot])
+                if int(self.seqs[slot]) == seq:
+                    return seq, timestamp, self.frames[slot]
+                continue
+
+            if self.isClosed():
+                return None
+            if not self.event.wait(timeout):
+                return None
+            self.event.clear()
+
+    def isIntact(self, seq) -> bool:
+        """
+        Whether the slot of frame seq still holds it, i.e. a view returned
+        by latest() was not overwritten while it was being used.
+
+        :return: Boolean
+        """
+        return int(self.seqs[seq % self.slots]) == seq
+
+    def close(self) -> None:
+        """
+        Detaches from the shared memory, and frees it if this side created it.
+        """
+        self.header = self.seqs = self.times = self.frames = None
+        try:
+            self.memory.close()
+        except BufferError:
+            # A reader still holds a frame view, the mapping goes with it
+            pass
+        if self.owner:
+            self.memory.unlink()
@@ -0,0 +1,457 @@
+import json
+import os
+import threading
+import time
+
+import cv2 as cv
+import numpy as np
+import handTrackingModule as htm
+import frameRingModule as frm
+
+'''
+This module gives handDetector consumers one way to read frames,
+whether they come from a webcam, a recorded video, a directory of
+images or a recorded landmark log. Recorded sources can be replayed in
+real time or as fast as possible, which is what reproducible FPS and
+latency measurements need on machines without a camera.
+
+Every source returns sourceFrame objects from read(), and None once
+it is exhausted. A ringSource reads frames another process captured
+into a frm.sharedFrameRing, and a latestFrameSource drains a live
+source on its own thread so read() always returns the newest frame
+instead of whatever is next in the driver's buffer. Landmark logs carry handLandmarks instead of images,
+so consumers can skip detection and drive the gesture engine directly.
+
+Landmark logs are either JSONL, one frame per line:
+    {"t": 0.033, "hands": [{"points": [[x, y, z], ...21], "handedness": "Left", "score": 0.98}]}
+or .npz with arrays points (frames, maxHands, 21, 3), counts (frames,),
+timestamps (frames,), scores (frames, maxHands) and handedness
+(frames, maxHands) strings. landmarkRecorder writes both.
+'''
+
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".bmp"}
+
+
+class sourceFrame:
+    """
+    One frame from a frameSource.
+
+    image is a BGR array (None for landmark logs) that the source may
+    reuse on the next read, landmarks is a handLandmarks or None,
+    timestamp is the capture time in seconds since the epoch and
+    index counts frames from 0.
+    """
+
+    def __init__(self, image, timestamp, index, landmarks=None):
+        self.image = image
+        self.timestamp = timestamp
+        self.index = index
+        self.landmarks = landmarks
+
+
+class frameSource:
+    """
+    Base class of every source. Recorded sources report a media time
+    for each frame and the base class turns it into a timestamp,
+    sleeping first when pacing is "realtime".
+    """
+
+    def __init__(self, pacing="realtime"):
+        """
+        :param: pacing, "realtime" replays at the recorded rate,
+        "fast" returns frames as fast as they can be read
+        """
+        if pacing not in ("realtime", "fast"):
+            raise ValueError(f"Unknown pacing: {pacing}")
+        self.pacing = pacing
+        self.startTime = None
+        self.index = 0
+
+    def pace(self, mediaTime) -> float:
+        """
+        Waits until mediaTime is due when pacing in real time.
+
+        :return: Float timestamp of the frame
+        """
+        if self.startTime is None:
+            self.startTime = time.time() - mediaTime
+
+        timestamp = self.startTime + mediaTime
+        if self.pacing == "realtime":
+            delay = timestamp - time.time()
+            if delay > 0:
+                time.sleep(delay)
+        return timestamp
+
+    def nextFrame(self, image, timestamp, landmarks=None):
+        frame = sourceFrame(image, timestamp, self.index, landmarks)
+        self.index += 1
+        return frame
+
+    def read(self):
+        """
+        :return: sourceFrame, or None when the source is exhausted
+        """
+        raise NotImplementedError
+
+    def isIntact(self, frame) -> bool:
+        """
+        Whether frame.image still holds the frame after it was used.
+        Only sources that hand out shared buffers can return False.
+        """
+        return True
+
+    def release(self) -> None:
+        pass
+
+    def __iter__(self):
+        while True:
+            frame = self.read()
+            if frame is None:
+                return
+            yield frame
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class cameraSource(frameSource):
+    """
+    A live cv.VideoCapture device, always real time.
+    """
+
+    def __init__(self, index=0, width=None, height=None):
+        super().__init__("realtime")
+        self.cap = cv.VideoCapture(index)
+        if width:
+            self.cap.set(cv.CAP_PROP_FRAME_WIDTH, width)
+        if height:
+            self.cap.set(cv.CAP_PROP_FRAME_HEIGHT, height)
+        self.buffer = None
+
+    def read(self):
+        # Reuse the previous capture buffer instead of allocating a frame
+        success, self.buffer = self.cap.read(self.buffer)
+        if not success:
+            return None
+        return self.nextFrame(self.buffer, time.time())
+
+    def release(self) -> None:
+        self.cap.release()
+
+
+class videoFileSource(frameSource):
+    """
+    A recorded video, paced by its frame rate.
+    """
+
+    def __init__(self, path, pacing="realtime", loop=False, fps=None):
+        """
+        :param: loop, start over at the end instead of stopping
+        :param: fps, overrides the frame rate stored in the file
+        """
+        super().__init__(pacing)
+        self.path = path
+        self.loop = loop
+        self.cap = cv.VideoCapture(path)
+        if not self.cap.isOpened():
+            raise FileNotFoundError(f"Cannot open video: {path}")
+        self.fps = fps or self.cap.get(cv.CAP_PROP_FPS) or 30.0
+        self.buffer = None
+
+    def read(self):
+        success, self.buffer = self.cap.read(self.buffer)
+        if not success and self.loop and self.index > 0:
+            self.cap.set(cv.CAP_PROP_POS_FRAMES, 0)
+            success, self.buffer = self.cap.read(self.buffer)
+        if not success:
+            return None
+        return self.nextFrame(self.buffer, self.pace(self.index / self.fps))
+
+    def release(self) -> None:
+        self.cap.release()
+
+
+class imageDirSource(frameSource):
+    """
+    A directory of still images in file name order, played at fps.
+    """
+
+    def __init__(self, path, pacing="realtime", loop=False, fps=30.0):
+        super().__init__(pacing)
+        self.loop = loop
+        self.fps = fps
+        self.paths = sorted(
+            os.path.join(path, name)
+            for name in os.listdir(path)
+            if os.path.splitext(name)[1].lower() in IMAGE_EXTENSIONS
+        )
+        if not self.paths:
+            raise FileNotFoundError(f"No images in: {path}")
+
+    def read(self):
+        if self.index >= len(self.paths) and not self.loop:
+            return None
+        image = cv.imread(self.paths[self.index % len(self.paths)])
+        if image is None:
+            return None
+        return self.nextFrame(image, self.pace(self.index / self.fps))
+
+
+class ringSource(frameSource):
+    """
+    The newest frames of a frm.sharedFrameRing, written by another
+    process. Images are views into shared memory, frames the reader
+    was too slow for are skipped and counted in dropped.
+    """
+
+    def __init__(self, ring, timeout=5.0):
+        """
+        :param: ring, sharedFrameRing, or its handle passed to a process
+        :param: timeout, seconds without a new frame before the source ends
+        """
+        super().__init__("fast")
+        self.ring = ring
+        self.timeout = timeout
+        self.seq = 0
+        self.dropped = 0
+
+    def read(self):
+        latest = self.ring.latest(self.seq, self.timeout)
+        if latest is None:
+            return None
+
+        seq, timestamp, image = latest
+        self.dropped += seq - self.seq - 1
+        self.seq = seq
+        return self.nextFrame(image, timestamp)
+
+    def isIntact(self, frame) -> bool:
+        # Only the newest frame is ever handed out
+        return self.ring.isIntact(self.seq)
+
+    def release(self) -> None:
+        self.ring.close()
+
+
+class latestFrameSource(frameSource):
+    """
+    Reads another source on a capture thread as fast as it delivers and
+    keeps only the newest frame, latest frame wins. Frames replaced
+    before read() got to them are counted in dropped.
+    """
+
+    def __init__(self, source):
+        """
+        :param: source, the frameSource to drain, usually a cameraSource
+        """
+        super().__init__("fast")
+        self.source = source
+        self.condition = threading.Condition()
+        self.stopped = False
+        self.ended = False
+        self.dropped = 0
+
+        # Triple buffering: the capture thread fills back while read()
+        # hands out front, and ready holds the newest complete frame
+        self.back = None
+        self.ready = None
+        self.front = None
+        self.readySeq = 0
+        self.readSeq = 0
+        self.readyTime = 0.0
+
+        self.thread = threading.Thread(target=self.capture, daemon=True)
+        self.thread.start()
+
+    def capture(self) -> None:
+        """
+        Capture thread, copies every frame of the source into the back
+        buffer and publishes it as the newest frame.
+        """
+        try:
+            while not self.stopped:
+                frame = self.source.read()
+                if frame is None:
+                    break
+                if self.back is None or self.back.shape != frame.image.shape:
+                    self.back = np.empty_like(frame.image)
+                np.copyto(self.back, frame.image)
+
+                with self.condition:
+                    self.back, self.ready = self.ready, self.back
+                    self.readySeq += 1
+                    self.readyTime = frame.timestamp
+                    self.condition.notify()
+        finally:
+            with self.condition:
+                self.ended = True
+                self.condition.notify()
+
+    def read(self):
+        with self.condition:
+            self.condition.wait_for(lambda: self.readySeq > self.readSeq or self.ended)
+            if self.readySeq == self.readSeq:
+                return None
+
+            self.dropped += self.readySeq - self.readSeq - 1
+            self.readSeq = self.readySeq
+            self.front, self.ready = self.ready, self.front
+            timestamp = self.readyTime
+
+        return self.nextFrame(self.front, timestamp)
+
+    def release(self) -> None:
+        self.stopped = True
+        self.thread.join()
+        self.source.release()
+
+
+def landmarksFromRecord(record):
+    """
+    Converts one JSONL landmark record to handLandmarks.
+
+    :return: handLandmarks
+    """
+    hands = record.get("hands", [])
+    points = np.array([hand["points"] for hand in hands], np.float32).reshape(len(hands), 21, 3)
+    handedness = [hand.get("handedness", "") for hand in hands]
+    scores = np.array([hand.get("score", 1.0) for hand in hands], np.float32)
+    return htm.handLandmarks(points, handedness, scores)
+
+
+class landmarkLogSource(frameSource):
+    """
+    A recorded landmark log (.jsonl or .npz), paced by its timestamps.
+    Frames have no image, only landmarks.
+    """
+
+    def __init__(self, path, pacing="realtime", loop=False):
+        super().__init__(pacing)
+        self.loop = loop
+
+        if path.endswith(".npz"):
+            data = np.load(path)
+            self.records = []
+            for i, count in enumerate(data["counts"]):
+                landmarks = htm.handLandmarks(
+                    data["points"][i, :count].astype(np.float32),
+                    [str(label) for label in data["handedness"][i, :count]],
+                    data["scores"][i, :count].astype(np.float32),
+                )
+                self.records.append((float(data["timestamps"][i]), landmarks))
+        else:
+            with open(path) as log:
+                self.records = [
+                    (float(record["t"]), landmarksFromRecord(record))
+                    for record in map(json.loads, log)
+                ]
+
+        if not self.records:
+            raise ValueError(f"Empty landmark log: {path}")
+        self.duration = self.records[-1][0] - self.records[0][0]
+
+    def read(self):
+        if self.index >= len(self.records) and not self.loop:
+            return None
+
+        lap, position = divmod(self.index, len(self.records))
+        recordTime, landmarks = self.records[position]
+        # Keep time moving forward across loops, one frame gap between laps
+        frameGap = self.duration / max(1, len(self.records) - 1)
+        mediaTime = recordTime - self.records[0][0] + lap * (self.duration + frameGap)
+
+        return self.nextFrame(None, self.pace(mediaTime), landmarks)
+
+
+class landmarkRecorder:
+    """
+    Records handLandmarks per frame to a .jsonl or .npz landmark log
+    that landmarkLogSource can replay.
+    """
+
+    def __init__(self, path, maxHands=2):
+        self.path = path
+        self.maxHands = maxHands
+        self.startTime = None
+        self.frames = []
+        self.log = None if path.endswith(".npz") else open(path, "w")
+
+    def write(self, landmarks, timestamp) -> None:
+        if self.startTime is None:
+            self.startTime = timestamp
+        t = timestamp - self.startTime
+
+        if self.log is None:
+            self.frames.append((t, landmarks))
+            return
+
+        hands = [
+            {
+                "points": landmarks.points[i].round(2).tolist(),
+                "handedness": landmarks.handedness[i] if i < len(landmarks.handedness) else "",
+                "score": float(landmarks.scores[i]) if i < len(landmarks.scores) else 1.0,
+            }
+            for i in range(len(landmarks))
+        ]
+        self.log.write(json.dumps({"t": round(t, 4), "hands": hands}) + "\n")
+
+    def close(self) -> None:
+        if self.log is not None:
+            self.log.close()
+            return
+
+        frames = len(self.frames)
+        points = np.zeros((frames, self.maxHands, 21, 3), np.float32)
+        scores = np.zeros((frames, self.maxHands), np.float32)
+        handedness = np.full((frames, self.maxHands), "", dtype="<U5")
+        counts = np.zeros(frames, np.int32)
+        timestamps = np.zeros(frames, np.float64)
+
+        for i, (t, landmarks) in enumerate(self.frames):
+            count = min(len(landmarks), self.maxHands)
+            counts[i] = count
+            timestamps[i] = t
+            points[i, :count] = landmarks.points[:count]
+            scores[i, :count] = landmarks.scores[:count]
+            handedness[i, :count] = landmarks.handedness[:count]
+
+        np.savez_compressed(
+            self.path,
+            points=points,
+            counts=counts,
+            timestamps=timestamps,
+            scores=scores,
+            handedness=handedness,
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def openSource(spec, pacing="realtime", loop=False, **options):
+    """
+    Opens a frame source from a specification: a camera index (int or
+    digit string), a frm.sharedFrameRing, an image directory, a
+    .jsonl/.npz landmark log, or any other path as a video file.
+
+    :param: options, extra keyword arguments for the source class
+    :return: frameSource
+    """
+    if isinstance(spec, int) or str(spec).isdigit():
+        return cameraSource(int(spec), **options)
+    if isinstance(spec, frm.sharedFrameRing):
+        return ringSource(spec, **options)
+
+    spec = str(spec)
+    if os.path.isdir(spec):
+        return imageDirSource(spec, pacing, loop, **options)
+    if spec.endswith(".jsonl") or spec.endswith(".npz"):
+        return landmarkLogSource(spec, pacing, loop)
+    return videoFileSource(spec, pacing, loop, **options)
@@ -0,0 +1,410 @@
+import inspect
+import time
+
+import numpy as np
+import handTrackingModule as htm
+import handTrackerModule as htr
+
+'''
+This module turns a stream of handLandmarks into gesture events.
+A gestureEngine runs every registered recognizer once per frame over a
+shared gestureFeatures object, which computes distances, finger states
+and bounding boxes at most once per frame as array ops over all hands,
+no matter how many recognizers ask for them.
+
+When the engine has a handTracker, recognizers see One-Euro smoothed
+landmarks and can read per-landmark velocities from the features.
+
+Each recognizer is a small state machine with tunable thresholds and
+returns a (usually empty) list of event dictionaries per frame. Every
+event has the recognizer "name" and a "gesture", plus any extra values.
+'''
+
+
+class gestureFeatures:
+    """
+    Lazily computed, per-frame features shared by every recognizer.
+    """
+
+    def __init__(self, landmarks, timestamp=None, velocities=None, leftMeans="Right"):
+        self.landmarks = landmarks
+        self.points = landmarks.points
+        self.timestamp = timestamp
+        self.velocities = velocities
+        self.leftMeans = leftMeans
+        self.cache = {}
+
+    def __len__(self) -> int:
+        return len(self.landmarks)
+
+    def cached(self, key, compute):
+        if key not in self.cache:
+            self.cache[key] = compute()
+        return self.cache[key]
+
+    def distance(self, id1, id2):
+        """
+        :return: Tuple of gaps (hands,) and centers (hands, 2), see htm.landmarkDistance
+        """
+        return self.cached(("distance", id1, id2), lambda: htm.landmarkDistance(self.points, id1, id2))
+
+    def velocity(self, id1, id2):
+        """
+        Velocity of the center point between two hand nodes, averaged over
+        the tracker's ring buffer. None when the engine has no tracker.
+
+        :return: float array (hands, 2) in pixels per second, or None
+        """
+        if self.velocities is None:
+            return None
+        return self.cached(("velocity", id1, id2), lambda: (self.velocities[:, id1] + self.velocities[:, id2]) / 2)
+
+    def fingersUp(self):
+        """
+        :return: int array (hands, 5), see htm.fingersUp
+        """
+        return self.cached("fingersUp", lambda: htm.fingersUp(self.points))
+
+    def boxes(self):
+        """
+        :return: int array (hands, 4), see htm.boundingBoxes
+        """
+        return self.cached("boxes", lambda: htm.boundingBoxes(self.points))
+
+    def spanAreas(self):
+        """
+        :return: int array (hands,), see htm.spanAreas
+        """
+        return self.cached("spanAreas", lambda: htm.spanAreas(self.points))
+
+    def controlHands(self, label, minScore):
+        """
+        :return: int array of hand indices, see htm.controlHands
+        """
+        return self.cached(
+            ("controlHands", label, minScore),
+            lambda: htm.controlHands(self.landmarks, label, minScore, self.leftMeans),
+        )
+
+
+class gestureRecognizer:
+    """
+    Base class of every recognizer.
+    """
+
+    name = "gesture"
+
+    def update(self, features) -> list:
+        """
+        Advances the state machine by one frame.
+
+        :return: List of event dictionaries
+        """
+        return []
+
+    def reset(self) -> None:
+        """
+        Forgets any gesture in progress.
+        """
+
+    def event(self, gesture, **values) -> dict:
+        return {'name': self.name, 'gesture': gesture, **values}
+
+
+class pinchRecognizer(gestureRecognizer):
+    """
+    Pinch-click and swipes, the handDetector.setCursorState state machine.
+    Closing the thumb and index tips starts a hover, opening them again
+    ends it as a click, or as a swipe if the pinch moved far enough.
+    With swipeSpeed set and a tracker on the engine, the swipe is decided
+    from the filtered pinch velocity at release instead of the raw
+    displacement between two frames.
+    """
+
+    name = "pinch"
+
+    def __init__(
+        self,
+        controlHand="Right",
+        minHandednessScore=0.8,
+        pinchGap=30,
+        swipeDistance=15,
+        zoneMaxY=160,
+        tipIds=(4, 8),
+        swipeSpeed=None,
+    ):
+        """
+        pinchRecognizer constructor.
+
+        :param: controlHand, minHandednessScore, see htm.controlHands
+        :param: pinchGap, tip gap in pixels below which the fingers are pinched
+        :param: swipeDistance, pixels the pinch must travel to be a swipe
+        :param: zoneMaxY, the pinch only counts above this y pixel
+        :param: tipIds, the two hand nodes that pinch
+        :param: swipeSpeed, pixels per second the pinch must be moving at
+        on release to be a swipe, None uses swipeDistance
+        """
+        self.controlHand = controlHand
+        self.minHandednessScore = minHandednessScore
+        self.pinchGap = pinchGap
+        self.swipeDistance = swipeDistance
+        self.zoneMaxY = zoneMaxY
+        self.tipIds = tipIds
+        self.swipeSpeed = swipeSpeed
+        self.reset()
+
+    def reset(self) -> None:
+        self.state = "none"
+        self.starting_x = 0
+        self.starting_y = 0
+
+    def update(self, features) -> list:
+        if len(features) == 0:
+            return []
+
+        gaps, centers = features.distance(*self.tipIds)
+        velocities = features.velocity(*self.tipIds) if self.swipeSpeed is not None else None
+        for i in features.controlHands(self.controlHand, self.minHandednessScore):
+            center_x, center_y = int(centers[i, 0]), int(centers[i, 1])
+            if center_y < self.zoneMaxY:
+                velocity = velocities[i] if velocities is not None else None
+                return self.step(float(gaps[i]), center_x, center_y, velocity)
+
+        return []
+
+    def swipeFromVelocity(self, velocity) -> str:
+        """
+        Classifies a release by the dominant axis of the pinch velocity.
+
+        :return: String gesture
+        """
+        velocity_x, velocity_y = float(velocity[0]), float(velocity[1])
+        if max(abs(velocity_x), abs(velocity_y)) < self.swipeSpeed:
+            return "click"
+        if abs(velocity_x) >= abs(velocity_y):
+            return "rightswipe" if velocity_x > 0 else "leftswipe"
+        return "downswipe" if velocity_y > 0 else "upswipe"
+
+    def step(self, gap, center_x, center_y, velocity=None) -> list:
+        if gap < self.pinchGap and self.state == "none":
+            self.starting_x = center_x
+            self.starting_y = center_y
+            self.state = "hover"
+        elif gap > self.pinchGap and self.state == "hover":
+            x_difference = center_x - self.starting_x
+            y_difference = center_y - self.starting_y
+
+            if velocity is not None:
+                gesture = self.swipeFromVelocity(velocity)
+            elif x_difference > self.swipeDistance:
+                gesture = "rightswipe"
+            elif x_difference < -self.swipeDistance:
+                gesture = "leftswipe"
+            elif y_difference > self.swipeDistance:
+                gesture = "downswipe"
+            elif y_difference < -self.swipeDistance:
+                gesture = "upswipe"
+            else:
+                gesture = "click"
+
+            self.state = "none"
+            return [self.event(gesture)]
+
+        return []
+
+
+class fingerCountRecognizer(gestureRecognizer):
+    """
+    Counts raised fingers over every hand, like getBothFingersUp,
+    and reports the count once it has been stable for a few frames.
+    """
+
+    name = "fingers"
+
+    def __init__(self, stableFrames=3):
+        """
+        fingerCountRecognizer constructor.
+
+        :param: stableFrames, frames a new count must hold before it is reported
+        """
+        self.stableFrames = stableFrames
+        self.reset()
+
+    def reset(self) -> None:
+        self.count = 0
+        self.candidate = 0
+        self.candidateFrames = 0
+
+    def update(self, features) -> list:
+        perHand = features.fingersUp().sum(axis=1) if len(features) else np.empty(0, np.int64)
+        count = int(perHand.sum())
+
+        if count == self.count:
+            self.candidateFrames = 0
+            return []
+
+        if count != self.candidate:
+            self.candidate = count
+            self.candidateFrames = 0
+        self.candidateFrames += 1
+
+        if self.candidateFrames < self.stableFrames:
+            return []
+
+        self.count = count
+        self.candidateFrames = 0
+        return [self.event("fingers", count=count, hands=[int(n) for n in perHand])]
+
+
+class sliderRecognizer(gestureRecognizer):
+    """
+    The thumb/index slider from learn-gestureVolume.py. The tip gap is
+    mapped to 0-100 while the hand is a usable distance from the camera.
+    """
+
+    name = "slider"
+
+    def __init__(
+        self,
+        controlHand="Right",
+        minHandednessScore=0.8,
+        minGap=20,
+        maxGap=200,
+        minArea=10000,
+        maxArea=40000,
+        zoneMaxY=150,
+        step=2,
+        tipIds=(4, 8),
+    ):
+        """
+        sliderRecognizer constructor.
+
+        :param: controlHand, minHandednessScore, see htm.controlHands
+        :param: minGap, maxGap, tip gaps in pixels mapped to 0 and 100
+        :param: minArea, maxArea, hand area in pixels that is close enough
+        to the camera to be calibrated, measured like the script on the
+        find2Hands box (see htm.spanAreas)
+        :param: zoneMaxY, the slider only moves above this y pixel
+        :param: step, smallest change in value that is reported
+        :param: tipIds, the two hand nodes whose gap sets the value
+        """
+        self.controlHand = controlHand
+        self.minHandednessScore = minHandednessScore
+        self.minGap = minGap
+        self.maxGap = maxGap
+        self.minArea = minArea
+        self.maxArea = maxArea
+        self.zoneMaxY = zoneMaxY
+        self.step = step
+        self.tipIds = tipIds
+        self.reset()
+
+    def reset(self) -> None:
+        self.value = None
+
+    def update(self, features) -> list:
+        if len(features) == 0:
+            return []
+
+        gaps, centers = features.distance(*self.tipIds)
+        areas = features.spanAreas()
+
+        for i in features.controlHands(self.controlHand, self.minHandednessScore):
+            if not self.minArea < areas[i] < self.maxArea or centers[i, 1] >= self.zoneMaxY:
+                continue
+
+            value = int(np.interp(gaps[i], [self.minGap, self.maxGap], [0, 100]))
+            if self.value is not None and abs(value - self.value) < self.step:
+                return []
+
+            self.value = value
+            return [self.event("slider", value=value)]
+
+        return []
+
+
+# Recognizers buildEngine can create by name
+RECOGNIZERS = {
+    pinchRecognizer.name: pinchRecognizer,
+    fingerCountRecognizer.name: fingerCountRecognizer,
+    sliderRecognizer.name: sliderRecognizer,
+}
+
+
+class gestureEngine:
+    """
+    Runs a set of registered recognizers over each frame of landmarks,
+    optionally smoothed by a handTracker first. A handednessCalibration
+    keeps the cursor hand guess of low-score hands in line with the labels.
+    """
+
+    def __init__(self, recognizers=None, tracker=None, calibration=None):
+        self.recognizers = list(recognizers or [])
+        self.tracker = tracker
+        self.calibration = calibration if calibration is not None else htm.handednessCalibration()
+
+    def register(self, recognizer):
+        """
+        Adds a recognizer, it runs after the ones already registered.
+
+        :return: The recognizer
+        """
+        self.recognizers.append(recognizer)
+        return recognizer
+
+    def get(self, name):
+        """
+        :return: The first registered recognizer called name, or None
+        """
+        return next((r for r in self.recognizers if r.name == name), None)
+
+    def process(self, landmarks, timestamp=None) -> list:
+        """
+        Runs every recognizer over one frame of landmarks.
+
+        :return: List of event dictionaries, in registration order
+        """
+        self.calibration.update(landmarks)
+        velocities = None
+        if self.tracker is not None:
+            timestamp = time.time() if timestamp is None else timestamp
+            landmarks, velocities = self.tracker.update(landmarks, timestamp)
+
+        features = gestureFeatures(landmarks, timestamp, velocities, self.calibration.leftMeans)
+        events = []
+        for recognizer in self.recognizers:
+            events.extend(recognizer.update(features))
+        return events
+
+    def reset(self) -> None:
+        if self.tracker is not None:
+            self.tracker.reset()
+        for recognizer in self.recognizers:
+            recognizer.reset()
+
+
+def buildEngine(names=("pinch",), options=None, trackerOptions=None, **shared):
+    """
+    Builds a gestureEngine from recognizer names.
+
+    :param: names, recognizer names from RECOGNIZERS, in evaluation order
+    :param: options, optional dictionary of name to constructor keyword arguments
+    :param: trackerOptions, keyword arguments of a handTracker to smooth
+    landmarks with, None disables smoothing
+    :param: shared, keyword arguments given to every recognizer that accepts
+    them, e.g. controlHand and minHandednessScore
+    :return: gestureEngine
+    """
+    options = options or {}
+    tracker = htr.handTracker(**trackerOptions) if trackerOptions is not None else None
+    calibration = htm.handednessCalibration(minScore=shared.get("minHandednessScore", 0.8))
+    engine = gestureEngine(tracker=tracker, calibration=calibration)
+
+    for name in names:
+        recognizerClass = RECOGNIZERS[name]
+        accepted = inspect.signature(recognizerClass).parameters
+        kwargs = {key: value for key, value in shared.items() if key in accepted}
+        kwargs.update(options.get(name, {}))
+        engine.register(recognizerClass(**kwargs))
+
+    return engine
@@ -0,0 +1,448 @@
+import asyncio
+import threading
+import time
+
+import handTrackingModule as htm
+import gestureEngineModule as gem
+import frameSourceModule as fsm
+import debugPreviewModule as dpm
+
+'''
+This module keeps the camera and MediaPipe work off the asyncio
+event loop. A gesturePipeline owns the frame source (a camera by
+default, see frameSourceModule), the handDetector and the gesture
+engine. A gestureWorker runs it on a thread and hands each gesture
+result back to the event loop (cameraPoolModule runs it in a process).
+A gestureBroadcaster shares one worker between every subscriber,
+so the camera is opened once and each frame is inferred once no
+matter how many dashboards are connected, and a gestureHub keeps
+one broadcaster per camera.
+
+Every message carries the pinch gesture, the cursor state, a frame
+sequence number, the capture and inference-done timestamps and the
+number of stale frames dropped so far, plus an "events" list when
+other recognizers of the gestureEngine fired on that frame. Subscribers
+may ask for events only, in which case frames where nothing changed
+are never queued for them.
+'''
+
+
+class gesturePipeline:
+    """
+    Frame source, detection and gesture engine of one camera.
+    """
+
+    def __init__(
+        self,
+        source=0,
+        sourceLoop=False,
+        latestFrame=True,
+        minDetectionConf=0.55,
+        modelComplexity=1,
+        idleAfter=2.0,
+        idleEveryN=10,
+        motionThreshold=8.0,
+        roi=None,
+        roiScale=1.0,
+        backend="solutions",
+        runningMode=None,
+        modelPath="hand_landmarker.task",
+        controlHand="Right",
+        minHandednessScore=0.8,
+        recognizers=("pinch",),
+        recognizerOptions=None,
+        trackerOptions=None,
+        preview=None,
+    ):
+        """
+        gesturePipeline constructor.
+
+        :param: source, camera index or recording, see fsm.openSource
+        :param: sourceLoop, replay a recording forever instead of stopping
+        :param: latestFrame, drain live sources on a capture thread and only
+        process the newest frame, see fsm.latestFrameSource
+        :param: minDetectionConf, detection confidence for handDetector
+        :param: modelComplexity, Mediapipe hand model, 0 is lighter than 1
+        :param: idleAfter, idleEveryN, motionThreshold, see htm.adaptiveScheduler
+        :param: roi, roiScale, region of interest, see htm.handDetector
+        :param: backend, modelPath, Mediapipe API, see htm.handDetector
+        :param: runningMode, tasks backend mode, None picks "live_stream"
+        for real-time sources and "video" for recordings replayed fast
+        :param: controlHand, minHandednessScore, which hand drives the
+        cursor, see htm.controlHands
+        :param: recognizers, recognizerOptions, names and per-name keyword
+        arguments of the recognizers to run, see gem.buildEngine
+        :param: trackerOptions, landmark smoothing, see htr.handTracker,
+        None disables it
+        :param: preview, debugPreviewModule.previewFeed offered every
+        processed frame, None disables it
+        """
+        self.source = source
+        self.sourceLoop = sourceLoop
+        self.latestFrame = latestFrame
+        self.minDetectionConf = minDetectionConf
+        self.modelComplexity = modelComplexity
+        self.idleAfter = idleAfter
+        self.idleEveryN = idleEveryN
+        self.motionThreshold = motionThreshold
+        self.roi = roi
+        self.roiScale = roiScale
+        self.backend = backend
+        self.runningMode = runningMode
+        self.modelPath = modelPath
+        self.controlHand = controlHand
+        self.minHandednessScore = minHandednessScore
+        self.recognizers = recognizers
+        self.recognizerOptions = recognizerOptions
+        self.trackerOptions = trackerOptions
+        self.preview = preview
+
+    def detectEvents(self, detector, scheduler, engine, preprocessor, frame, source=None, captureTimes=None):
+        """
+        Runs hand detection on a frame, if the scheduler allows it,
+        and feeds the landmarks to the gesture engine. Frames replayed
+        from a landmark log skip detection, frames the source overwrote
+        while they were preprocessed are dropped.
+
+        In live_stream mode the landmarks belong to an earlier frame,
+        whose capture time is looked up in captureTimes (frame index to
+        timestamp). Frames that brought no new result skip the engine.
+
+        :return: Tuple of List of gesture event dictionaries, Float
+        capture timestamp of the frame they were detected on, which is
+        None when there is no new detection to report, and Boolean
+        whether hand detection ran for them
+        """
+        if frame.landmarks is not None:
+            return engine.process(frame.landmarks, frame.timestamp), frame.timestamp, False
+
+        image, rgb = preprocessor.process(frame.image)
+        if source is not None and not source.isIntact(frame):
+            return [], frame.timestamp, False
+        if not scheduler.shouldDetect(image):
+            return [], frame.timestamp, False
+
+        if captureTimes is None:
+            captureTimes = {}
+        captureTimes[frame.index] = frame.timestamp
+        landmarks = detector.findLandmarks(image, rgb, frame.index)
+        if not detector.hasNewResult:
+            # Bounded in case results stop arriving
+            while len(captureTimes) > 64:
+                del captureTimes[next(iter(captureTimes))]
+            return [], None, False
+
+        resultId = detector.resultFrameId
+        captured = captureTimes.get(resultId, frame.timestamp)
+        # Results arrive in frame order, frames Mediapipe skipped never get one
+        for index in [i for i in captureTimes if resultId is None or i <= resultId]:
+            del captureTimes[index]
+        scheduler.update(len(landmarks) > 0)
+
+        return engine.process(landmarks, captured), captured, True
+
+    def buildMessage(self, engine, events, seq, captured, inferred=None, dropped=0) -> dict:
+        """
+        Builds the websocket message for one frame.
+
+        :param: captured, inferred, capture and inference-done timestamps,
+        inferred is None for frames hand detection did not run on
+        :param: dropped, stale frames the source skipped so far
+
+        :return: Dictionary
+        """
+        pinch = engine.get(gem.pinchRecognizer.name)
+        gesture = "none"
+        others = []
+        for event in events:
+            if event['name'] == gem.pinchRecognizer.name:
+                gesture = event['gesture']
+            else:
+                others.append(event)
+
+        message = {
+            'gesture': gesture,
+            'state': pinch.state if pinch else "none",
+            'seq': seq,
+            'ts': captured,
+            'dropped': dropped,
+        }
+        if inferred is not None:
+            message['ts_inferred'] = inferred
+        if others:
+            message['events'] = others
+        return message
+
+    def run(self, publish, stopEvent) -> None:
+        """
+        Reads and processes frames until stopEvent is set or the source
+        ends, calling publish with each message and finally with None.
+        """
+        source = None
+        detector = None
+        try:
+            source = fsm.openSource(self.source, loop=self.sourceLoop)
+            runningMode = self.runningMode or ("live_stream" if source.pacing == "realtime" else "video")
+            if self.latestFrame and source.pacing == "realtime" and not isinstance(source, fsm.landmarkLogSource):
+                # Frames queue up in the driver while inference runs, skip to the newest
+                source = fsm.latestFrameSource(source)
+            detector = htm.handDetector(
+                modelComplexity=self.modelComplexity,
+                minDetectionConf=self.minDetectionConf,
+                roi=self.roi,
+                roiScale=self.roiScale,
+                backend=self.backend,
+                runningMode=runningMode,
+                modelPath=self.modelPath,
+                # The server never shows frames, they may be shared buffers
+                headless=True,
+            )
+            scheduler = htm.adaptiveScheduler(
+                idleAfter=self.idleAfter,
+                idleEveryN=self.idleEveryN,
+                motionThreshold=self.motionThreshold,
+            )
+
+            preprocessor = htm.framePreprocessor(brightness=1.2)
+            engine = gem.buildEngine(
+                self.recognizers,
+                self.recognizerOptions,
+                self.trackerOptions,
+                controlHand=self.controlHand,
+                minHandednessScore=self.minHandednessScore,
+            )
+
+            seq = 0
+            captureTimes = {}
+            while not stopEvent.is_set():
+                frame = source.read()
+                if frame is None:
+                    break
+
+                events, captured, detected = self.detectEvents(
+                    detector, scheduler, engine, preprocessor, frame, source, captureTimes
+                )
+                if self.preview is not None and frame.image is not None and self.preview.isWatched():
+                    # The preprocessed frame with the last detection, idle frames reuse it
+                    self.preview.offer(preprocessor.bgr, detector.cachedLandmarks)
+                if captured is None:
+                    # live_stream result still pending, nothing new to send
+                    continue
+
+                seq += 1
+                # Skipped and replayed frames would read as 0 s inference
+                inferred = time.time() if detected else None
+                dropped = getattr(source, 'dropped', 0)
+                publish(self.buildMessage(engine, events, seq, captured, inferred, dropped))
+        finally:
+            if detector is not None:
+                detector.close()
+            if source is not None:
+                source.release()
+            print("Frame source released")
+            if getattr(source, 'dropped', 0):
+                print(f"{source.dropped} stale frames dropped")
+            publish(None)
+
+
+class gestureWorker(threading.Thread):
+    """
+    Dedicated capture/inference thread that publishes
+    gesture results back to the event loop.
+    """
+
+    def __init__(self, loop, deliver, **pipelineOptions):
+        """
+        gestureWorker constructor.
+
+        :param: loop, the running asyncio event loop deliver runs on
+        :param: deliver, callback run on the event loop with each message
+        :param: pipelineOptions, keyword arguments passed to gesturePipeline
+        """
+        super().__init__(daemon=True)
+        self.loop = loop
+        self.deliver = deliver
+        self.pipeline = gesturePipeline(**pipelineOptions)
+        self.stopEvent = threading.Event()
+
+    def stop(self) -> None:
+        """
+        Asks the worker to finish its current frame and release the camera.
+        """
+        self.stopEvent.set()
+
+    def publish(self, message) -> None:
+        """
+        Schedules message onto the event loop. Safe to call from the worker.
+        A message of None signals the end of the stream.
+        """
+        try:
+            self.loop.call_soon_threadsafe(self.deliver, message)
+        except RuntimeError:
+            # The event loop is already closed, nobody is listening
+            self.stopEvent.set()
+
+    def run(self) -> None:
+        self.pipeline.run(self.publish, self.stopEvent)
+
+
+def deliverLatest(queue, message) -> None:
+    """
+    Puts message on an asyncio queue from the event loop. Drops the oldest
+    message if the consumer has fallen behind, so latency stays bounded.
+    """
+    if queue.full():
+        queue.get_nowait()
+    queue.put_nowait(message)
+
+
+async def stopWorker(worker) -> None:
+    """
+    Stops a worker and waits for it without blocking the event loop.
+    """
+    worker.stop()
+    await asyncio.to_thread(worker.join)
+
+
+class gestureBroadcaster:
+    """
+    Process-wide gesture pipeline shared by every /ws subscriber.
+    The worker starts with the first subscriber and the camera is
+    released when the last one leaves.
+    """
+
+    def __init__(self, queueSize=8, workerClass=gestureWorker, metrics=None, cameraId=0, **workerOptions):
+        """
+        gestureBroadcaster constructor.
+
+        :param: queueSize, messages buffered per subscriber before dropping
+        :param: workerClass, gestureWorker, or cameraPoolModule.processWorker
+        to run the pipeline in its own process
+        :param: metrics, metricsModule.gestureMetrics every message is recorded in
+        :param: cameraId, camera label of the metrics
+        :param: workerOptions, keyword arguments passed to workerClass
+        """
+        self.queueSize = queueSize
+        self.workerClass = workerClass
+        self.metrics = metrics
+        self.cameraId = cameraId
+        self.workerOptions = workerOptions
+        self.subscribers = {}
+        self.worker = None
+        # Joins a worker whose source ended, see deliver
+        self.reaping = None
+        self.lastState = "none"
+        self.lock = asyncio.Lock()
+
+    async def subscribe(self, eventsOnly=False):
+        """
+        Registers a new subscriber and starts the worker if needed.
+
+        :param: eventsOnly, only queue gestures and cursor state transitions
+        :return: asyncio.Queue of gesture messages, None marks end of stream
+        """
+        queue = asyncio.Queue(maxsize=self.queueSize)
+
+        async with self.lock:
+            self.subscribers[queue] = eventsOnly
+            if self.reaping is not None:
+                # The previous worker must let go of the camera first
+                await self.reaping
+                self.reaping = None
+            if self.worker is None:
+                loop = asyncio.get_running_loop()
+                worker = self.workerClass(
+                    loop,
+                    lambda message: self.deliver(worker, message),
+                    **self.workerOptions,
+                )
+                self.worker = worker
+                worker.start()
+
+        return queue
+
+    async def unsubscribe(self, queue) -> None:
+        """
+        Removes a subscriber and stops the worker once nobody is left.
+        """
+        async with self.lock:
+            self.subscribers.pop(queue, None)
+            if self.subscribers or self.worker is None:
+                return
+
+            worker = self.worker
+            self.worker = None
+            self.lastState = "none"
+            await stopWorker(worker)
+
+    def deliver(self, worker, message) -> None:
+        """
+        Runs on the event loop. Fans a worker message out to every subscriber.
+        """
+        if worker is not self.worker:
+            # A stopped worker flushing its last frame
+            return
+
+        if message is None:
+            # The camera stopped on its own, the next subscriber restarts it
+            # once the old worker (thread, or process and reader) is joined
+            self.reaping = asyncio.create_task(stopWorker(worker))
+            self.worker = None
+            self.lastState = "none"
+            isEvent = True
+        else:
+            # A real gesture, another recognizer firing, or the cursor starting/ending a hover
+            isEvent = (
+                message['gesture'] != "none"
+                or 'events' in message
+                or message['state'] != self.lastState
+            )
+            self.lastState = message['state']
+            if self.metrics is not None:
+                self.metrics.observeMessage(self.cameraId, message)
+
+        for queue, eventsOnly in self.subscribers.items():
+            if isEvent or not eventsOnly:
+                deliverLatest(queue, message)
+
+
+class gestureHub:
+    """
+    One gestureBroadcaster per camera, looked up by camera id.
+    """
+
+    def __init__(self, sources, previewOptions=None, **broadcasterOptions):
+        """
+        gestureHub constructor.
+
+        :param: sources, list of source specifications, the camera id is
+        the position in the list, see fsm.openSource
+        :param: previewOptions, keyword arguments of a
+        debugPreviewModule.previewFeed per camera, None disables previews
+        :param: broadcasterOptions, keyword arguments of every gestureBroadcaster
+        """
+        self.previews = [
+            dpm.previewFeed(**previewOptions) if previewOptions is not None else None
+            for _ in sources
+        ]
+        self.broadcasters = [
+            gestureBroadcaster(source=source, cameraId=cameraId, preview=preview, **broadcasterOptions)
+            for cameraId, (source, preview) in enumerate(zip(sources, self.previews))
+        ]
+
+    def get(self, cameraId):
+        """
+        :return: gestureBroadcaster of the camera, or None for an unknown id
+        """
+        if 0 <= cameraId < len(self.broadcasters):
+            return self.broadcasters[cameraId]
+        return None
+
+    def getPreview(self, cameraId):
+        """
+        :return: previewFeed of the camera, or None when previews are off
+        or the id is unknown
+        """
+        if 0 <= cameraId < len(self.previews):
+            return self.previews[cameraId]
+        return None
@@ -0,0 +1,167 @@
+import collections
+import math
+
+import numpy as np
+import handTrackingModule as htm
+
+'''
+This module smooths the landmark stream of handDetector over time.
+Each hand gets a One-Euro filter over all of its landmarks at once,
+which removes jitter while the hand is still and stays responsive
+when it moves, and a short ring buffer of filtered positions that
+velocities are measured over. Steadier landmarks let the detector run
+at a lower model complexity or resolution without losing gestures.
+
+One-Euro filter: Casiez, Roussel, Vogel (2012), "1 Euro Filter: A Simple
+Speed-based Low-pass Filter for Noisy Input in Interactive Systems".
+'''
+
+
+def smoothingFactor(cutoff, dt):
+    """
+    Exponential smoothing factor of a low-pass filter with the given cutoff.
+
+    :return: Float, or array when cutoff is an array
+    """
+    tau = 1.0 / (2 * math.pi * cutoff)
+    return 1.0 / (1.0 + tau / dt)
+
+
+class oneEuroFilter:
+    """
+    One-Euro filter over an array of any shape, every element filtered
+    independently in one vectorized step.
+    """
+
+    def __init__(self, minCutoff=1.0, beta=0.01, dCutoff=1.0):
+        """
+        oneEuroFilter constructor.
+
+        :param: minCutoff, cutoff frequency (Hz) while still, lower is smoother
+        :param: beta, how fast the cutoff rises with speed, higher lags less
+        :param: dCutoff, cutoff frequency (Hz) of the speed estimate
+        """
+        self.minCutoff = minCutoff
+        self.beta = beta
+        self.dCutoff = dCutoff
+        self.reset()
+
+    def reset(self) -> None:
+        self.value = None
+        self.velocity = None
+        self.timestamp = None
+
+    def __call__(self, value, timestamp):
+        """
+        Filters one sample.
+
+        :return: The filtered array
+        """
+        if self.value is None:
+            self.value = value.copy()
+            self.velocity = np.zeros_like(value)
+            self.timestamp = timestamp
+            return self.value
+
+        dt = max(timestamp - self.timestamp, 1e-6)
+
+        alphaD = smoothingFactor(self.dCutoff, dt)
+        self.velocity = alphaD * (value - self.value) / dt + (1 - alphaD) * self.velocity
+
+        cutoff = self.minCutoff + self.beta * np.abs(self.velocity)
+        alpha = smoothingFactor(cutoff, dt)
+        self.value = alpha * value + (1 - alpha) * self.value
+        self.timestamp = timestamp
+
+        return self.value
+
+
+class handTrack:
+    """
+    Filter and position history of one hand.
+    """
+
+    def __init__(self, historyFrames, minCutoff, beta, dCutoff):
+        self.filter = oneEuroFilter(minCutoff, beta, dCutoff)
+        self.history = collections.deque(maxlen=historyFrames)
+        self.lastSeen = None
+
+    def update(self, points, timestamp):
+        smoothed = self.filter(points, timestamp)
+        self.history.append((timestamp, smoothed[:, :2].copy()))
+        self.lastSeen = timestamp
+        return smoothed
+
+    def velocity(self):
+        """
+        Average velocity of every landmark over the ring buffer.
+
+        :return: float array (21, 2) in pixels per second
+        """
+        if len(self.history) < 2:
+            return np.zeros((21, 2), np.float32)
+
+        firstTime, firstPoints = self.history[0]
+        lastTime, lastPoints = self.history[-1]
+        return (lastPoints - firstPoints) / max(lastTime - firstTime, 1e-6)
+
+
+class handTracker:
+    """
+    Keeps one handTrack per hand, matched across frames by
+    Mediapipe handedness label.
+    """
+
+    def __init__(self, historyFrames=6, minCutoff=1.0, beta=0.01, dCutoff=1.0, lostAfter=0.5):
+        """
+        handTracker constructor.
+
+        :param: historyFrames, length of the ring buffer velocities use
+        :param: minCutoff, beta, dCutoff, see oneEuroFilter
+        :param: lostAfter, seconds a hand may be missing before its track is dropped
+        """
+        self.historyFrames = historyFrames
+        self.minCutoff = minCutoff
+        self.beta = beta
+        self.dCutoff = dCutoff
+        self.lostAfter = lostAfter
+        self.tracks = {}
+
+    def keys(self, landmarks):
+        """
+        Track key of each hand, its handedness label or its index, made
+        unique when Mediapipe gives two hands the same label.
+        """
+        keys = []
+        for i in range(len(landmarks)):
+            key = landmarks.handedness[i] if i < len(landmarks.handedness) else i
+            if key in keys:
+                key = (key, i)
+            keys.append(key)
+        return keys
+
+    def update(self, landmarks, timestamp):
+        """
+        Filters one frame of landmarks.
+
+        :return: Tuple of handLandmarks with smoothed points, and float
+        array (hands, 21, 2) of landmark velocities in pixels per second
+        """
+        points = np.empty_like(landmarks.points)
+        velocities = np.zeros((len(landmarks), 21, 2), np.float32)
+
+        for i, key in enumerate(self.keys(landmarks)):
+            track = self.tracks.get(key)
+            if track is None:
+                track = handTrack(self.historyFrames, self.minCutoff, self.beta, self.dCutoff)
+                self.tracks[key] = track
+            points[i] = track.update(landmarks.points[i], timestamp)
+            velocities[i] = track.velocity()
+
+        for key in [key for key, track in self.tracks.items() if timestamp - track.lastSeen > self.lostAfter]:
+            del self.tracks[key]
+
+        return htm.handLandmarks(points, landmarks.handedness, landmarks.scores), velocities
+
+    def reset(self) -> None:
+        self.tracks = {}
@@ -2,10 +2,248 @@ import cv2 as cv
 import numpy as np
 import mediapipe as mp
 import math
+import os
+import threading
+import time
 mp_drawing = mp.solutions.drawing_utils
 mp_drawing_styles = mp.solutions.drawing_styles
 mp_hands = mp.solutions.hands
 
+# Hand node ids kept by the filtered lists of find2Hands, in order
+VALID_IDS = np.array([3, 4, 6, 8, 10, 12, 14, 16, 18, 20])
+# Base and tip node ids of the index, middle, ring and pinky fingers
+FINGER_BASE_IDS = np.array([6, 10, 14, 18])
+FINGER_TIP_IDS = np.array([8, 12, 16, 20])
+
+# Node pairs drawn as bones by drawLandmarks
+HAND_CONNECTIONS = tuple(sorted(mp.solutions.hands.HAND_CONNECTIONS))
+
+# Running modes of the Mediapipe Tasks backend
+RUNNING_MODES = {
+    "video": mp.tasks.vision.RunningMode.VIDEO,
+    "live_stream": mp.tasks.vision.RunningMode.LIVE_STREAM,
+}
+
+
+class handLandmarks:
+    """
+    Every landmark of every detected hand for one frame.
+
+    points is a float32 array of shape (hands, 21, 3) holding the
+    full-frame pixel x, y and Mediapipe's relative depth z of each node.
+    handedness and scores hold Mediapipe's label ("Left"/"Right")
+    and confidence for each hand, in the same order.
+    """
+
+    def __init__(self, points, handedness, scores):
+        self.points = points
+        self.handedness = handedness
+        self.scores = scores
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+
+def boundingBoxes(points):
+    """
+    Gets the bounding box of every hand.
+
+    :return: int array of shape (hands, 4) of xMin, yMin, xMax, yMax
+    """
+    if len(points) == 0:
+        return np.empty((0, 4), np.int32)
+    xy = points[:, :, :2]
+    return np.concatenate((xy.min(axis=1), xy.max(axis=1)), axis=1).astype(np.int32)
+
+
+def spanAreas(points):
+    """
+    Gets the area of the box find2Hands reports for every hand, thumb tip
+    to pinky tip across and wrist to middle tip high. It is what the
+    area gates of the learn-* scripts were tuned on.
+
+    :return: int array (hands,)
+    """
+    pixels = points[:, :, :2].astype(np.int32)
+    width = np.abs(pixels[:, 20, 0] - pixels[:, 4, 0])
+    height = np.abs(pixels[:, 12, 1] - pixels[:, 0, 1])
+    return width * height
+
+
+def landmarkDistance(points, id1, id2):
+    """
+    Gets the distance and center point between two hand nodes of every hand.
+
+    :return: Tuple of float array (hands,) of distances and
+    int array (hands, 2) of center x, center y
+    """
+    first = points[:, id1, :2]
+    second = points[:, id2, :2]
+    gaps = np.hypot(*(second - first).T)
+    centers = (first.astype(np.int32) + second.astype(np.int32)) // 2
+    return gaps, centers
+
+
+def isLeftHand(points):
+    """
+    Geometric handedness guess, thumb tip to the left of the pinky tip.
+    On the mirrored frames of the gesture path, with the palm facing the
+    camera, this is the user's right hand, which Mediapipe labels "Right".
+
+    :return: bool array (hands,)
+    """
+    return points[:, 4, 0] < points[:, 20, 0]
+
+
+def controlHands(landmarks, label="Right", minScore=0.8, leftMeans="Right"):
+    """
+    Picks the hands that may drive the cursor. Mediapipe's handedness
+    label is trusted when its score reaches minScore, otherwise (or when
+    no handedness was reported) the geometric isLeftHand guess is used.
+    The default "Right" is the hand the old isLeft heuristic selected.
+
+    :param: leftMeans, the label an isLeftHand hand is guessed to have,
+    see handednessCalibration
+    :return: int array of hand indices, in detection order
+    """
+    guess = isLeftHand(landmarks.points)
+    if label != leftMeans:
+        guess = ~guess
+
+    if len(landmarks.handedness) != len(landmarks):
+        return np.flatnonzero(guess)
+
+    confident = landmarks.scores >= minScore
+    labelled = np.array(landmarks.handedness) == label
+    return np.flatnonzero(np.where(confident, labelled, guess))
+
+
+class handednessCalibration:
+    """
+    Learns which Mediapipe label the isLeftHand guess stands for from
+    confidently labelled hands, so controlHands guesses low-score hands
+    the way the labels would call them instead of flipping the cursor
+    hand whenever a score crosses minScore.
+    """
+
+    def __init__(self, minScore=0.8, leftMeans="Right", memory=30):
+        """
+        handednessCalibration constructor.
+
+        :param: minScore, handedness score a hand needs to be learned from
+        :param: leftMeans, label of an isLeftHand hand until one was learned
+        :param: memory, confident hands it takes to flip a learned polarity
+        """
+        self.minScore = minScore
+        self.leftMeans = leftMeans
+        self.memory = memory
+        # > 0 votes isLeftHand means "Right", < 0 means "Left"
+        self.votes = 0
+
+    def update(self, landmarks) -> None:
+        if len(landmarks) == 0 or len(landmarks.handedness) != len(landmarks):
+            return
+
+        confident = landmarks.scores >= self.minScore
+        if not confident.any():
+            return
+
+        guess = isLeftHand(landmarks.points[confident])
+        right = np.array(landmarks.handedness)[confident] == "Right"
+        agree = int(np.count_nonzero(guess == right))
+        self.votes = int(np.clip(self.votes + 2 * agree - len(guess), -self.memory, self.memory))
+        if self.votes != 0:
+            self.leftMeans = "Right" if self.votes > 0 else "Left"
+
+
+def fingersUp(points):
+    """
+    Detects which fingers of every hand are up (1) or down (0),
+    thumb first, the same way handDetector.detect does.
+
+    :return: int array of shape (hands, 5)
+    """
+    thumbTipX = points[:, 4, 0]
+    thumbBaseX = points[:, 3, 0]
+    # right means thumb is more right than pinky
+    right = thumbTipX > points[:, 20, 0]
+    thumb = np.where(right, thumbBaseX < thumbTipX, thumbBaseX > thumbTipX)
+
+    fingers = points[:, FINGER_BASE_IDS, 1] > points[:, FINGER_TIP_IDS, 1]
+    return np.column_stack((thumb, fingers)).astype(np.int8)
+
+
+def drawLandmarks(frame, landmarks, color=(0, 255, 0), pointColor=(255, 0, 255)) -> None:
+    """
+    Draws the nodes and connections of every hand onto frame, in place.
+
+    :param: landmarks, handLandmarks in frame pixels
+    """
+    for hand in landmarks.points[:, :, :2].astype(np.int32).tolist():
+        for start, end in HAND_CONNECTIONS:
+            cv.line(frame, hand[start], hand[end], color, 2)
+        for point in hand:
+            cv.circle(frame, point, 3, pointColor, cv.FILLED)
+
+
+def overlayFrame(frame, landmarks, out=None):
+    """
+    Copies frame and draws the hands onto the copy, leaving frame
+    untouched so it can stay shared with detection.
+
+    :param: out, optional preallocated array of the same shape to copy into
+    :return: The annotated copy
+    """
+    if out is None or out.shape != frame.shape:
+        out = np.empty_like(frame)
+    np.copyto(out, frame)
+
+    drawLandmarks(out, landmarks)
+    for xMin, yMin, xMax, yMax in boundingBoxes(landmarks.points).astype(np.int32).tolist():
+        cv.rectangle(out, (xMin, yMin), (xMax, yMax), (0, 255, 0), 1)
+    return out
+
+
+def solutionsArrays(results):
+    """
+    Landmarks of a legacy mp.solutions.hands result.
+
+    :return: Tuple of normalized float array (hands, 21, 3), List of
+    String handedness and List of Float scores, or None without hands
+    """
+    if results is None or not results.multi_hand_landmarks:
+        return None
+
+    normalized = np.array(
+        [[(lm.x, lm.y, lm.z) for lm in hand.landmark] for hand in results.multi_hand_landmarks],
+        dtype=np.float32,
+    )
+    handedness = []
+    scores = []
+    for hand in results.multi_handedness or []:
+        handedness.append(hand.classification[0].label)
+        scores.append(hand.classification[0].score)
+    return normalized, handedness, scores
+
+
+def tasksArrays(result):
+    """
+    Landmarks of a Mediapipe Tasks HandLandmarkerResult.
+
+    :return: Same as solutionsArrays
+    """
+    if result is None or not result.hand_landmarks:
+        return None
+
+    normalized = np.array(
+        [[(lm.x, lm.y, lm.z) for lm in hand] for hand in result.hand_landmarks],
+        dtype=np.float32,
+    )
+    handedness = [hand[0].category_name for hand in result.handedness]
+    scores = [hand[0].score for hand in result.handedness]
+    return normalized, handedness, scores
+
+
 class handDetector:
     """
     Class to detect and draw
@@ -19,56 +257,160 @@ class handDetector:
         modelComplexity=1,
         minDetectionConf=0.5,
         minTrackingConf=0.5,
+        roi=None,
+        roiScale=1.0,
+        roiTrackMargin=0.15,
+        backend="solutions",
+        runningMode="video",
+        modelPath="hand_landmarker.task",
+        headless=False,
     ):
         """
         HandDetector constructor to set up mediapipe library
         and initialize cursor state.
+
+        :param: roi, optional (x0, y0, x1, y1) region of interest as
+        fractions of the frame, detection only looks inside it
+        :param: roiScale, factor the region is resized by before inference
+        :param: roiTrackMargin, fraction of the frame a locked hand's box is
+        grown by when expanding the region to keep tracking it
+        :param: backend, "solutions" for the legacy mp.solutions.hands API,
+        "tasks" for the Mediapipe Tasks HandLandmarker
+        :param: runningMode, tasks backend only. "video" infers each frame
+        synchronously, "live_stream" submits frames asynchronously and
+        returns the newest finished result, so capture never waits on
+        inference (results lag by the inference time, busy frames are skipped)
+        :param: modelPath, tasks backend only, path of hand_landmarker.task
+        :param: headless, never draw, frames are only read. For servers that
+        never show the frame, use overlayFrame to look at one
         """
         self.mode = mode
         self.max_num_hands = maxHands
         self.model_complexity = modelComplexity
         self.min_detection_confidence = minDetectionConf
         self.min_tracking_confidence = minTrackingConf
+        self.backend = backend
+        self.runningMode = runningMode
+        self.headless = headless
 
         # Set up mediapipe library and tools
         self.mpHands = mp.solutions.hands
-        self.hands = self.mpHands.Hands(
-            self.mode,
-            self.max_num_hands,
-            self.model_complexity,
-            self.min_detection_confidence,
-            self.min_tracking_confidence,
-        )
+        if backend == "solutions":
+            self.hands = self.mpHands.Hands(
+                self.mode,
+                self.max_num_hands,
+                self.model_complexity,
+                self.min_detection_confidence,
+                self.min_tracking_confidence,
+            )
+        elif backend == "tasks":
+            self.hands = self.createLandmarker(modelPath)
+        else:
+            raise ValueError(f"Unknown backend: {backend}")
+
+        # Tasks timestamps must increase, live results arrive on a Mediapipe thread
+        self.timestampMs = 0
+        self.liveLock = threading.Lock()
+        self.pendingRois = {}
+        self.liveResult = (None, 0, 0, 0, 0)
+        self.liveFrameId = None
+        self.liveResultMs = 0
+        self.usedResultMs = 0
+
+        # Frame the last findLandmarks result was detected on, and whether
+        # it is a new detection. A live_stream result is only new once.
+        self.resultFrameId = None
+        self.hasNewResult = False
 
         self.mpDraw = mp.solutions.drawing_utils 
 
+        # Set up region of interest
+        self.roi = roi
+        self.roiScale = roiScale
+        self.roiTrackMargin = roiTrackMargin
+        self.lockedBox = None
+
+        # Mediapipe handedness of the last detection
+        self.handedness = []
+        self.handScores = []
+
+        # Preallocated buffers reused across frames, keyed by name
+        self.buffers = {}
+
+        # Detection of the last frame, see findLandmarks
+        self.cachedKey = None
+        self.cachedFrame = None
+        self.cachedLandmarks = None
+
         # Set up cursor state
         self.starting_x = 0
         self.starting_y = 0
         self.cursorState = "none"
         self.cursorGesture = "none"
 
-    def drawHands(self, frame):
+    def createLandmarker(self, modelPath):
+        """
+        Creates the Mediapipe Tasks HandLandmarker of the tasks backend.
+
+        :return: mp.tasks.vision.HandLandmarker
+        """
+        if self.runningMode not in RUNNING_MODES:
+            raise ValueError(f"Unknown running mode: {self.runningMode}")
+        if not os.path.exists(modelPath):
+            raise FileNotFoundError(f"Hand landmarker model not found: {modelPath}")
+
+        live = self.runningMode == "live_stream"
+        options = mp.tasks.vision.HandLandmarkerOptions(
+            base_options=mp.tasks.BaseOptions(model_asset_path=modelPath),
+            running_mode=RUNNING_MODES[self.runningMode],
+            num_hands=self.max_num_hands,
+            min_hand_detection_confidence=self.min_detection_confidence,
+            min_hand_presence_confidence=self.min_detection_confidence,
+            min_tracking_confidence=self.min_tracking_confidence,
+            result_callback=self.onLiveResult if live else None,
+        )
+        return mp.tasks.vision.HandLandmarker.create_from_options(options)
+
+    def onLiveResult(self, result, image, timestampMs) -> None:
+        """
+        Result callback of live_stream mode, runs on a Mediapipe thread.
+        """
+        with self.liveLock:
+            roi, frameId = self.pendingRois.pop(timestampMs, ((0, 0, 0, 0), None))
+            # Frames Mediapipe skipped while busy never get a callback
+            for stale in [t for t in self.pendingRois if t < timestampMs]:
+                del self.pendingRois[stale]
+            self.liveResult = (result, *roi)
+            self.liveFrameId = frameId
+            self.liveResultMs = timestampMs
+
+    def close(self) -> None:
+        """
+        Releases the Mediapipe graph.
+        """
+        self.hands.close()
+
+    def drawHands(self, frame, rgb=None, frameId=None):
         """
         Draws hand nodes and connections of any detectable
         hand.
 
         :param: A Matlike frame read from video capture
+        :param: rgb, frameId, see findLandmarks
         :return: A Matlike frame with hand nodes and connections drawn on it
         """
-        # Mediapipe works in RGB
-        rgb = cv.cvtColor(frame, cv.COLOR_BGR2RGB)
-        # Using Mediapipe Hands module to detect hands
-        hands_detected = self.hands.process(rgb)
+        landmarks = self.findLandmarks(frame, rgb, frameId)
+        if not self.headless:
+            drawLandmarks(frame, landmarks)
+        return frame
 
-        if hands_detected:
-            for handLms in hands_detected:
-                # Using Mediapipe Hands module to draw nodes and connections
-                self.mpDraw.draw_landmarks(
-                    frame, handLms, self.mpHands.HAND_CONNECTIONS
-                )
+    def shouldDraw(self, draw) -> bool:
+        """
+        Whether a draw=True request is honoured, never in headless mode.
 
-        return frame
+        :return: Boolean
+        """
+        return draw and not self.headless
 
     def isValidId(self, id: int) -> bool:
         """
@@ -92,93 +434,255 @@ class handDetector:
             or id == 20  # Pinky Tip
         )
 
-    def find2Hands(self, frame, draw=True):
+    def getRoi(self, width, height):
+        """
+        Gets the pixel region detection should run on. When a hand is
+        locked the configured region is grown to cover it as well.
+
+        :return: Tuple of x0, y0, x1, y1 pixel bounds
+        """
+        if self.roi is None:
+            return 0, 0, width, height
+
+        x0, y0, x1, y1 = self.roi
+        x0, y0, x1, y1 = int(x0 * width), int(y0 * height), int(x1 * width), int(y1 * height)
+
+        if self.lockedBox is not None:
+            marginX = int(self.roiTrackMargin * width)
+            marginY = int(self.roiTrackMargin * height)
+            xMin, yMin, xMax, yMax = self.lockedBox
+            x0, y0 = min(x0, xMin - marginX), min(y0, yMin - marginY)
+            x1, y1 = max(x1, xMax + marginX), max(y1, yMax + marginY)
+
+        return max(0, x0), max(0, y0), min(width, x1), min(height, y1)
+
+    def getBuffer(self, name, shape, dtype=np.uint8):
+        """
+        Gets a preallocated buffer, only reallocating when the shape changes.
+
+        :return: numpy array
+        """
+        buffer = self.buffers.get(name)
+        if buffer is None or buffer.shape != shape or buffer.dtype != dtype:
+            buffer = np.empty(shape, dtype)
+            self.buffers[name] = buffer
+        return buffer
+
+    def processRoi(self, frame, rgb=None, frameId=None):
+        """
+        Runs Mediapipe on the region of interest of a frame.
+        Passing the RGB version of the frame (see framePreprocessor)
+        skips the colour conversion.
+
+        :param: frameId, optional key of the frame, kept as resultFrameId
+        :return: Tuple of Mediapipe results and the x0, y0, width, height
+        of the region, used to map landmarks back to full-frame pixels.
+        None in live_stream mode while no new result has arrived
+        """
+        height, width, _ = frame.shape
+        x0, y0, x1, y1 = self.getRoi(width, height)
+
+        if rgb is None:
+            # Mediapipe works in RGB
+            rgb = cv.cvtColor(frame, cv.COLOR_BGR2RGB, dst=self.getBuffer("rgb", frame.shape))
+
+        region = rgb[y0:y1, x0:x1]
+        if self.roiScale != 1.0:
+            size = (max(1, int((x1 - x0) * self.roiScale)), max(1, int((y1 - y0) * self.roiScale)))
+            region = cv.resize(
+                region,
+                size,
+                dst=self.getBuffer("roi", (size[1], size[0], 3)),
+                interpolation=cv.INTER_AREA,
+            )
+        elif not region.flags["C_CONTIGUOUS"]:
+            # Column crops are strided views, Mediapipe wants packed rows
+            packed = self.getBuffer("roi", region.shape)
+            np.copyto(packed, region)
+            region = packed
+
+        if self.backend == "tasks":
+            return self.detectTasks(region, (x0, y0, x1 - x0, y1 - y0), frameId)
+
+        self.resultFrameId = frameId
+        # Using Hands module in Media Pipe to detect hands
+        hands_detected = self.hands.process(region)
+
+        return hands_detected, x0, y0, x1 - x0, y1 - y0
+
+    def detectTasks(self, region, roi, frameId=None):
+        """
+        Runs the Tasks HandLandmarker on a packed RGB region.
+
+        :return: Same as processRoi. In live_stream mode the newest finished
+        result and the region it was detected in, not necessarily this one,
+        or None when that result was already returned
+        """
+        self.timestampMs = max(self.timestampMs + 1, int(time.monotonic() * 1000))
+        image = mp.Image(image_format=mp.ImageFormat.SRGB, data=region)
+
+        if self.runningMode == "video":
+            self.resultFrameId = frameId
+            return (self.hands.detect_for_video(image, self.timestampMs), *roi)
+
+        with self.liveLock:
+            self.pendingRois[self.timestampMs] = (roi, frameId)
+        self.hands.detect_async(image, self.timestampMs)
+        with self.liveLock:
+            if self.liveResultMs == self.usedResultMs:
+                return None
+            self.usedResultMs = self.liveResultMs
+            self.resultFrameId = self.liveFrameId
+            return self.liveResult
+
+    def findLandmarks(self, frame, rgb=None, frameId=None):
+        """
+        Detects hands and converts every landmark to full-frame pixels
+        in a single vectorized step.
+
+        Detection runs once per frame, every accessor and drawing helper
+        called again on the same frame reuses the result. Frames are told
+        apart by frameId, or by the frame object itself when it is None,
+        so callers that read every frame into the same buffer (cameraSource,
+        framePreprocessor) must pass a frameId such as a frame counter.
+
+        In live_stream mode the landmarks may belong to an earlier frame,
+        resultFrameId tells which. When no new result arrived since the
+        last call, hasNewResult is False and the previous landmarks are
+        returned again.
+
+        :param: rgb, optional RGB copy of frame, skips the conversion
+        :param: frameId, optional key of the frame, e.g. its sequence number
+        :return: handLandmarks
+        """
+        key = ("id", frameId) if frameId is not None else ("frame", id(frame))
+        if key == self.cachedKey and (frameId is not None or frame is self.cachedFrame):
+            return self.cachedLandmarks
+
+        detected = self.processRoi(frame, rgb, frameId)
+        self.hasNewResult = detected is not None
+        if detected is not None:
+            landmarks = self.extractLandmarks(*detected)
+        elif self.cachedLandmarks is not None:
+            landmarks = self.cachedLandmarks
+        else:
+            landmarks = handLandmarks(np.empty((0, 21, 3), np.float32), [], np.empty(0, np.float32))
+
+        # Holding the frame keeps its id from being reused by the next one
+        self.cachedKey = key
+        self.cachedFrame = frame if frameId is None else None
+        self.cachedLandmarks = landmarks
+        return landmarks
+
+    def extractLandmarks(self, hands_detected, roiX, roiY, roiWidth, roiHeight):
+        """
+        Converts the Mediapipe results of processRoi to full-frame pixels
+        and updates the tracked region and handedness.
+
+        :return: handLandmarks
+        """
+        arrays = tasksArrays(hands_detected) if self.backend == "tasks" else solutionsArrays(hands_detected)
+        if arrays is None:
+            self.lockedBox = None
+            self.handedness = []
+            self.handScores = []
+            return handLandmarks(np.empty((0, 21, 3), np.float32), [], np.empty(0, np.float32))
+
+        normalized, handedness, scores = arrays
+        points = normalized * np.array((roiWidth, roiHeight, roiWidth), np.float32)
+        points += np.array((roiX, roiY, 0), np.float32)
+
+        self.handedness = handedness
+        self.handScores = scores
+
+        # Keep tracking the union of every hand found
+        boxes = boundingBoxes(points)
+        self.lockedBox = tuple(int(v) for v in (*boxes[:, :2].min(axis=0), *boxes[:, 2:].max(axis=0)))
+
+        return handLandmarks(points, handedness, np.array(scores, np.float32))
+
+    def find2Hands(self, frame, draw=True, rgb=None, frameId=None):
         """
         Finds the center-x and center-y locations of filtered hand nodes,
-        and a bounding box each hand.
+        and a bounding box each hand. Locations are full-frame pixels even
+        when detection runs on a region of interest.
 
+        :param: rgb, frameId, see findLandmarks
         :return: Tuple of List of List of hand node id and location,
         and List of bounding box boundary coordinates for each hand
         """
-        # Mediapipe works in RGB
-        rgb = cv.cvtColor(frame, cv.COLOR_BGR2RGB)
-        # Using Hands module in Media Pipe to detect hands
-        hands_detected = self.hands.process(rgb)
+        landmarks = self.findLandmarks(frame, rgb, frameId)
+        pixels = landmarks.points[:, :, :2].astype(np.int32)
 
-        height, width, _ = frame.shape
         bothLmList = []
         bbList = []
 
-        if hands_detected.multi_hand_landmarks:
-            for hand in hands_detected.multi_hand_landmarks:
-                singleLmList = []
-
-                xMin = 0
-                xMax = width
-                yMin = 0
-                yMax = height
-
-                for id, lm in enumerate(hand.landmark):
-                    if id == 0:  # Palm Bottom
-                        yMin = int(lm.y * height)
-                    elif id == 4:  # Thumb
-                        xMin = int(lm.x * width)
-                    elif id == 12:  # Middle Tip
-                        yMax = int(lm.y * height)
-                    elif id == 20:  # Pinky Tip
-                        xMax = int(lm.x * width)
-
-                    if self.isValidId(id):
-                        singleLmList.append([id, int(lm.x * width), int(lm.y * height)])
-
-                bbList.append((xMin, yMin, xMax, yMax))
-                bothLmList.append(singleLmList)
-
-                if draw:
-                    cv.rectangle(
-                        frame,
-                        (xMin, yMin),
-                        (xMax, yMax),
-                        (0, 255, 0),
-                        1,
-                    )
+        for hand in pixels:
+            bothLmList.append([[int(id), int(x), int(y)] for id, (x, y) in zip(VALID_IDS, hand[VALID_IDS])])
+
+            # Thumb, Palm Bottom, Pinky Tip, Middle Tip
+            xMin, yMin, xMax, yMax = int(hand[4, 0]), int(hand[0, 1]), int(hand[20, 0]), int(hand[12, 1])
+            bbList.append((xMin, yMin, xMax, yMax))
+
+            if self.shouldDraw(draw):
+                cv.rectangle(
+                    frame,
+                    (xMin, yMin),
+                    (xMax, yMax),
+                    (0, 255, 0),
+                    1,
+                )
 
         return bothLmList, bbList
 
-    def findHandLocations(self, frame, hand=0, draw=False):
+    def getHandedness(self):
+        """
+        Gets Mediapipe's handedness for the hands of the last detection,
+        in the same order as the lists returned by find2Hands.
+
+        :return: List of Tuple of String label ("Left"/"Right") and Float score
+        """
+        return list(zip(self.handedness, self.handScores))
+
+    def findHandLocations(self, frame, hand=0, draw=False, frameId=None):
         """
         Private Legacy
         """
-        lmLocList = []
-        boundingBox = []
-        # Mediapipe works in RGB
-        rgb = cv.cvtColor(frame, cv.COLOR_BGR2RGB)
-        # Using Hands module in Media Pipe to detect hands
-        hands_detected = self.hands.process(rgb)
-        if hands_detected.multi_hand_landmarks:
-            myHand = hands_detected.multi_hand_landmarks[hand]
-            xList = []
-            yList = []
+        lmBothLocList, bBoxList = self.findBothHandLocations(frame, frameId=frameId)
+        if hand >= len(lmBothLocList):
+            return [], []
 
-            for id, lm in enumerate(myHand.landmark):
-                height, width, channel = frame.shape
-                # multiplies the ratio with frame size
-                center_x, center_y = int(lm.x * width), int(lm.y * height)
+        lmLocList = lmBothLocList[hand]
+        boundingBox = bBoxList[hand]
 
-                xList.append(center_x)
-                yList.append(center_y)
+        if self.shouldDraw(draw):
+            for id, center_x, center_y in lmLocList:
+                cv.circle(frame, (center_x, center_y), 2, (255, 0, 255), cv.FILLED)
 
-                lmLocList.append([id, center_x, center_y])
+            buffer = 10
+            cv.rectangle(
+                frame,
+                (boundingBox[0] - buffer, boundingBox[1] - buffer),
+                (boundingBox[2] + buffer, boundingBox[3] + buffer),
+                (0, 255, 0),
+                1,
+            )
 
-                if draw:
-                    cv.circle(frame, (center_x, center_y), 2, (255, 0, 255), cv.FILLED)
+        return lmLocList, boundingBox
 
-            xMin, xMax = min(xList), max(xList)
-            yMin, yMax = min(yList), max(yList)
-            boundingBox = xMin, yMin, xMax, yMax
-            buffer = 10
+    def findBothHandLocations(self, frame, draw=False, frameId=None):
+        """
+        Private Legacy
+        """
+        landmarks = self.findLandmarks(frame, frameId=frameId)
+        pixels = landmarks.points[:, :, :2].astype(np.int32)
 
-            if draw:
+        lmBothLocList = [[[id, int(x), int(y)] for id, (x, y) in enumerate(hand)] for hand in pixels]
+        bBoxList = [tuple(int(v) for v in box) for box in boundingBoxes(landmarks.points)]
+
+        if self.shouldDraw(draw):
+            buffer = 10
+            for boundingBox in bBoxList:
                 cv.rectangle(
                     frame,
                     (boundingBox[0] - buffer, boundingBox[1] - buffer),
@@ -187,53 +691,6 @@ class handDetector:
                     1,
                 )
 
-        return lmLocList, boundingBox
-
-    def findBothHandLocations(self, frame, draw=False):
-        """
-        Private Legacy
-        """
-        # Mediapipe works in RGB
-        rgb = cv.cvtColor(frame, cv.COLOR_BGR2RGB)
-        # Using Hands module in Media Pipe to detect hands
-        hands_detected = self.hands.process(rgb)
-        lmBothLocList = []
-        bBoxList = []
-        if hands_detected.multi_hand_landmarks:
-
-            for myHand in hands_detected.multi_hand_landmarks:
-                xList = []
-                yList = []
-                boundingBox = []
-                singleLocList = []
-
-                for id, lm in enumerate(myHand.landmark):
-                    height, width, channel = frame.shape
-                    # multiplies the ratio with frame size
-                    center_x, center_y = int(lm.x * width), int(lm.y * height)
-
-                    xList.append(center_x)
-                    yList.append(center_y)
-
-                    singleLocList.append([id, center_x, center_y])
-
-                xMin, xMax = min(xList), max(xList)
-                yMin, yMax = min(yList), max(yList)
-                boundingBox = xMin, yMin, xMax, yMax
-
-                if draw:
-                    buffer = 10
-                    cv.rectangle(
-                        frame,
-                        (boundingBox[0] - buffer, boundingBox[1] - buffer),
-                        (boundingBox[2] + buffer, boundingBox[3] + buffer),
-                        (0, 255, 0),
-                        1,
-                    )
-
-                bBoxList.append(boundingBox)
-                lmBothLocList.append(singleLocList)
-
         return lmBothLocList, bBoxList
 
     def findDistance(self, frm, lmList, point1, point2, draw=False):
@@ -250,7 +707,7 @@ class handDetector:
 
         gapLength = math.hypot(second_x - first_x, second_y - first_y)
 
-        if draw:
+        if self.shouldDraw(draw):
             cv.line(frm, (first_x, first_y), (second_x, second_y), (110, 170, 255), 1)
             cv.circle(frm, (center_x, center_y), 10, (0, 106, 255), cv.FILLED)
             # if the distance is between the hand nodes is practically zero
@@ -390,3 +847,128 @@ class handDetector:
             secondDetected = self.detect(lmBoth[1], secondDetected)
 
         return firstDetected, secondDetected
+
+
+class framePreprocessor:
+    """
+    Mirrors and brightens camera frames into preallocated buffers,
+    and keeps an RGB copy ready for handDetector. Nothing is
+    allocated per frame once the first frame has been seen.
+    """
+
+    def __init__(self, brightness=1.2, flip=True):
+        """
+        framePreprocessor constructor.
+
+        :param: brightness, gain applied to every channel, saturating at 255
+        :param: flip, mirror the frame horizontally (selfie view)
+        """
+        self.brightness = brightness
+        self.flip = flip
+        # Same rounding and saturation as cv.addWeighted(frame, brightness, ...)
+        self.lut = np.clip(np.round(np.arange(256) * brightness), 0, 255).astype(np.uint8)
+
+        self.bgr = None
+        self.rgb = None
+
+    def process(self, frame):
+        """
+        Preprocesses a BGR frame. The returned arrays are reused by the
+        next call, copy them if they need to outlive the current frame.
+
+        :return: Tuple of the processed BGR frame and its RGB copy
+        """
+        if self.bgr is None or self.bgr.shape != frame.shape:
+            self.bgr = np.empty_like(frame)
+            self.rgb = np.empty_like(frame)
+
+        if self.flip:
+            cv.flip(frame, 1, dst=self.bgr)
+        else:
+            np.copyto(self.bgr, frame)
+
+        if self.brightness != 1.0:
+            cv.LUT(self.bgr, self.lut, dst=self.bgr)
+
+        cv.cvtColor(self.bgr, cv.COLOR_BGR2RGB, dst=self.rgb)
+
+        return self.bgr, self.rgb
+
+
+class adaptiveScheduler:
+    """
+    Decides which frames are worth running handDetector on.
+    Runs every frame while hands are around, drops to every Nth
+    frame once no hand has been seen for a while, and wakes up
+    early when a cheap motion check sees something move.
+    """
+
+    def __init__(
+        self,
+        idleAfter=2.0,
+        idleEveryN=10,
+        motionThreshold=8.0,
+        motionSize=(64, 48),
+    ):
+        """
+        adaptiveScheduler constructor.
+
+        :param: idleAfter, seconds without a hand before going idle
+        :param: idleEveryN, while idle, run detection every Nth frame
+        :param: motionThreshold, mean absolute grey-level change (0-255) on
+        a thumbnail that forces detection while idle, None disables it
+        :param: motionSize, (width, height) of the motion thumbnail
+        """
+        self.idleAfter = idleAfter
+        self.idleEveryN = max(1, idleEveryN)
+        self.motionThreshold = motionThreshold
+        self.motionSize = motionSize
+
+        self.lastHandTime = time.time()
+        self.framesSinceDetect = 0
+        self.prevThumb = None
+
+    def isIdle(self, now=None) -> bool:
+        """
+        :return: Boolean, True once no hand has been seen for idleAfter seconds
+        """
+        now = time.time() if now is None else now
+        return now - self.lastHandTime > self.idleAfter
+
+    def hasMotion(self, frame) -> bool:
+        """
+        Compares a small greyscale thumbnail of frame with the previous one.
+
+        :return: Boolean
+        """
+        thumb = cv.resize(frame, self.motionSize, interpolation=cv.INTER_AREA)
+        thumb = cv.cvtColor(thumb, cv.COLOR_BGR2GRAY)
+        prevThumb, self.prevThumb = self.prevThumb, thumb
+
+        if prevThumb is None:
+            return False
+        return cv.absdiff(thumb, prevThumb).mean() > self.motionThreshold
+
+    def shouldDetect(self, frame, now=None) -> bool:
+        """
+        Decides whether the detector should run on this frame.
+        Call update() with the outcome whenever this returns True.
+
+        :return: Boolean
+        """
+        if not self.isIdle(now):
+            self.prevThumb = None
+            return True
+
+        self.framesSinceDetect += 1
+        if self.motionThreshold is not None and self.hasMotion(frame):
+            return True
+        return self.framesSinceDetect >= self.idleEveryN
+
+    def update(self, handsFound, now=None) -> None:
+        """
+        Records the result of a detection, a hand ramps back to full rate.
+        """
+        self.framesSinceDetect = 0
+        if handsFound:
+            self.lastHandTime = time.time() if now is None else now
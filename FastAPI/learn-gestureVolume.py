@@ -2,14 +2,18 @@ import cv2 as cv
 import numpy as np
 import time
 import os
+import sys
 import math
 import handTrackingModule as htm
+import frameSourceModule as fsm
 
 '''
 This module is able to read the location of the index and thumb tips,
 then calculate the gap between them. Upon movement of these two fingers,
 the gap length will change and a normalized value between 0-100 is returned.
 This module can be applied to control some sort of slider or zoom. 
+Pass a video file or image directory as the first argument to replay
+a recording instead of reading the webcam.
 
 Note: the distance of the hand from the camera distorts the result of the
 gap. Needs to be calibrated
@@ -18,12 +22,14 @@ gap. Needs to be calibrated
 
 widthCam, heightCam = 1080, 720
 
-cap = cv.VideoCapture(0)
-cap.set(3, widthCam)
-cap.set(4, heightCam)
+if len(sys.argv) > 1:
+    cap = fsm.openSource(sys.argv[1])
+else:
+    cap = fsm.cameraSource(0, widthCam, heightCam)
 
 # higher detection confidence
 detector = htm.handDetector(minDetectionConf=0.5)
+preprocessor = htm.framePreprocessor(brightness=1.5)
 # pTime = 0
 
 slider = 300
@@ -31,15 +37,13 @@ norm = 0
 
 while True:
     # webcam set up
-    success, frame = cap.read()
-    if not success:
+    sourceFrame = cap.read()
+    if sourceFrame is None:
         break
     
-    frame = cv.flip(frame, 1)
-    frame = cv.addWeighted(frame, 1.5, np.zeros(frame.shape, frame.dtype), 0, 0)
-    # frame = detector.findHands(frame, draw=False)
-    # lmBothList, bb = detector.findBothHandLocations(frame)
-    lmBothList, bb = detector.find2Hands(frame)
+    frame, rgb = preprocessor.process(sourceFrame.image)
+    # The preprocessor reuses its buffers, so frames are keyed by index
+    lmBothList, bb = detector.find2Hands(frame, rgb=rgb, frameId=sourceFrame.index)
 
     if lmBothList and len(lmBothList) > 0:
         firstDetected, secondDetected = detector.getBothFingersUp(lmBothList)
@@ -1,24 +1,27 @@
 # --- Standard Library Imports ---
 import asyncio
+import base64
+import bisect
 import json
 import os
-from datetime import datetime, time, timedelta
-from typing import Annotated, AsyncGenerator, List, Optional, Tuple
+import time as clock
+from collections import OrderedDict
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from typing import Annotated, AsyncGenerator, List, Literal, Optional, Tuple
 
 # --- Third-Party Imports ---
-import cv2 as cv
-import numpy as np
 import pytz
 import uvicorn
 from dotenv import load_dotenv
-from fastapi import (Depends, FastAPI, HTTPException, Response, WebSocket,
-                   WebSocketDisconnect)
+from fastapi import (Depends, FastAPI, HTTPException, Query, Response,
+                     WebSocket, WebSocketDisconnect)
 from starlette.websockets import WebSocketState
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from sqlalchemy import Date, cast
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 """
 GCP VERTEX
 """
@@ -32,9 +35,11 @@ from google.protobuf.struct_pb2 import Value
 import aiohttp
 
 # --- Local Application Imports ---
-import handTrackingModule as htm
+import cameraPoolModule as cpm
+import gestureStreamModule as gsm
+import metricsModule as mm
 import models
-from database import SessionLocal, engine
+from database import AsyncSessionLocal, create_missing_indexes, engine
 
 # --- Load Environment Variables ---
 # This should be called once, right after all imports.
@@ -62,7 +67,9 @@ app.add_middleware(
     allow_origins=origins,
     allow_credentials=True,
     allow_methods=['*'],
-    allow_headers=['*']
+    allow_headers=['*'],
+    # Lets browser clients read the keyset cursor of /calendar/ and /checklist/
+    expose_headers=['X-Next-Cursor']
 )
 """
 ------------------------ SPEECH TO TEXT CONFIG -------------------------
@@ -107,22 +114,123 @@ async def get_gemini_response(text_prompt: str, websocket: WebSocket):
 
     except Exception as e:
         await websocket.send_text("Sorry, I couldn't get a response.")
+"""
+------------------------ GESTURE CONFIG -------------------------
+"""
+# One capture + detection pipeline per camera, shared by every /ws connection.
+# GESTURE_SOURCES is a comma separated list of camera indexes, video files,
+# image directories or landmark logs (.jsonl/.npz), /ws?camera=N picks one
+# (GESTURE_SOURCE sets a single source). GESTURE_SOURCE_LOOP=1 replays
+# recordings forever. Live sources are drained on a capture thread and only
+# the newest frame is inferred, GESTURE_LATEST_FRAME=0 processes every frame.
+# GESTURE_WORKER=process runs each camera's pipeline in its own process so
+# inference for several cameras uses several cores, and
+# with GESTURE_SHARED_CAPTURE=1 the camera is read here and frames reach that
+# process through a shared-memory ring of GESTURE_RING_SLOTS frames.
+# With no hand in view for GESTURE_IDLE_AFTER seconds, detection drops to
+# every GESTURE_IDLE_EVERY_N frames unless the motion check fires.
+# GESTURE_ROI="x0,y0,x1,y1" (fractions of the frame) limits detection to the
+# cursor zone, GESTURE_ROI_SCALE downsizes that region before inference.
+# GESTURE_BACKEND=tasks swaps mp.solutions.hands for the Mediapipe Tasks
+# HandLandmarker loaded from GESTURE_HAND_MODEL (hand_landmarker.task), which
+# runs live cameras asynchronously, GESTURE_RUNNING_MODE=video|live_stream forces a mode.
+# GESTURE_CONTROL_HAND is the Mediapipe handedness label that drives the cursor,
+# the user's own hand on the mirrored frames. "Right" is the hand the thumb/pinky
+# heuristic used to pick.
+# GESTURE_PREVIEW=1 serves /debug/preview?camera=N, an MJPEG view of what the
+# detector sees, encoded only while watched, at most GESTURE_PREVIEW_FPS frames
+# per second and GESTURE_PREVIEW_WIDTH pixels wide.
+# GESTURE_RECOGNIZERS lists the gesture engine recognizers to run (pinch,fingers,slider).
+# GESTURE_SMOOTHING=1 One-Euro filters the landmarks, GESTURE_SWIPE_SPEED (px/s)
+# then decides swipes from the filtered velocity, which tolerates a cheaper
+# GESTURE_MODEL_COMPLEXITY=0.
+def parse_gesture_roi(value: Optional[str]) -> Optional[Tuple[float, float, float, float]]:
+    """
+    Parses GESTURE_ROI, four frame fractions x0,y0,x1,y1 with
+    0 <= x0 < x1 <= 1 and 0 <= y0 < y1 <= 1. None or "" is the full frame.
+    """
+    if not value:
+        return None
+    try:
+        x0, y0, x1, y1 = (float(v) for v in value.split(","))
+    except ValueError:
+        raise ValueError(f"GESTURE_ROI must be four comma separated fractions x0,y0,x1,y1, got {value!r}") from None
+    if not (0 <= x0 < x1 <= 1 and 0 <= y0 < y1 <= 1):
+        raise ValueError(f"GESTURE_ROI needs 0 <= x0 < x1 <= 1 and 0 <= y0 < y1 <= 1, got {value!r}")
+    return x0, y0, x1, y1
+
+gesture_roi = parse_gesture_roi(os.getenv("GESTURE_ROI"))
+gesture_swipe_speed = os.getenv("GESTURE_SWIPE_SPEED")
+gesture_tracker_options = None
+if os.getenv("GESTURE_SMOOTHING", "0") == "1":
+    gesture_tracker_options = {
+        'minCutoff': float(os.getenv("GESTURE_SMOOTHING_MIN_CUTOFF", "1.0")),
+        'beta': float(os.getenv("GESTURE_SMOOTHING_BETA", "0.01")),
+    }
+
+gesture_sources = os.getenv("GESTURE_SOURCES", os.getenv("GESTURE_SOURCE", "0")).split(",")
+gesture_worker = gsm.gestureWorker
+gesture_worker_options = {}
+if os.getenv("GESTURE_WORKER", "thread") == "process":
+    gesture_worker = cpm.processWorker
+    gesture_worker_options = {
+        'sharedCapture': os.getenv("GESTURE_SHARED_CAPTURE", "0") == "1",
+        'ringSlots': int(os.getenv("GESTURE_RING_SLOTS", "4")),
+    }
+
+# Stage latencies, frame and gesture counts, scraped from /metrics
+gesture_metrics = mm.gestureMetrics()
+
+gesture_preview_options = None
+if os.getenv("GESTURE_PREVIEW", "0") == "1":
+    gesture_preview_options = {
+        'maxFps': float(os.getenv("GESTURE_PREVIEW_FPS", "10")),
+        'maxWidth': int(os.getenv("GESTURE_PREVIEW_WIDTH", "640")),
+    }
+
+gesture_hub = gsm.gestureHub(
+    gesture_sources,
+    previewOptions=gesture_preview_options,
+    workerClass=gesture_worker,
+    metrics=gesture_metrics,
+    **gesture_worker_options,
+    sourceLoop=os.getenv("GESTURE_SOURCE_LOOP", "0") == "1",
+    latestFrame=os.getenv("GESTURE_LATEST_FRAME", "1") == "1",
+    minDetectionConf=0.55,
+    modelComplexity=int(os.getenv("GESTURE_MODEL_COMPLEXITY", "1")),
+    idleAfter=float(os.getenv("GESTURE_IDLE_AFTER", "2.0")),
+    idleEveryN=int(os.getenv("GESTURE_IDLE_EVERY_N", "10")),
+    motionThreshold=float(os.getenv("GESTURE_MOTION_THRESHOLD", "8.0")),
+    roi=gesture_roi,
+    roiScale=float(os.getenv("GESTURE_ROI_SCALE", "1.0")),
+    backend=os.getenv("GESTURE_BACKEND", "solutions"),
+    runningMode=os.getenv("GESTURE_RUNNING_MODE") or None,
+    modelPath=os.getenv("GESTURE_HAND_MODEL", "hand_landmarker.task"),
+    controlHand=os.getenv("GESTURE_CONTROL_HAND", "Right"),
+    minHandednessScore=float(os.getenv("GESTURE_MIN_HANDEDNESS_SCORE", "0.8")),
+    recognizers=tuple(os.getenv("GESTURE_RECOGNIZERS", "pinch").split(",")),
+    recognizerOptions={'pinch': {'swipeSpeed': float(gesture_swipe_speed) if gesture_swipe_speed else None}},
+    trackerOptions=gesture_tracker_options,
+)
+
+# Shortest /ws?heartbeat= interval in seconds, shorter ones are raised to it
+GESTURE_MIN_HEARTBEAT = 0.5
+
 """
 ------------------------ DATABASE CONFIG -------------------------
 """
 
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
-# Session is a type hint, Depends tells FastAPI to first call get_db
+# AsyncSession is a type hint, Depends tells FastAPI to first call get_db
 # The value of get_db is then injected as an argument into the endpoints
-db_dependency = Annotated[Session, Depends(get_db)]
-# creating our database
+db_dependency = Annotated[AsyncSession, Depends(get_db)]
+# creating our database, once at startup so the sync engine is fine
 models.Base.metadata.create_all(bind=engine)
+# and adding indexes that older dash.db files were created without
+create_missing_indexes(models.Base.metadata)
 
 """
 ------------------------ PYDANTIC MODELS -------------------------
@@ -161,6 +269,157 @@ class EventModel(EventBase):
     class Config:
         from_attributes = True
 
+class EventBucket(BaseModel):
+    start: datetime
+    end: datetime
+    events: List[EventModel]
+
+"""
+------------------------ CALENDAR RANGE CONFIG -------------------------
+"""
+# Timezone of the today/month views, and how long (seconds) a range result
+# is served from memory. Writes to eventlist clear the cache right away.
+CALENDAR_TZ = os.getenv("CALENDAR_TZ", "America/Los_Angeles")
+CALENDAR_CACHE_TTL = float(os.getenv("CALENDAR_CACHE_TTL", "30"))
+
+class RangeCache:
+    """
+    Small TTL cache of calendar range results. clear() bumps a version
+    so a query that raced a write cannot store its stale result.
+    """
+
+    def __init__(self, ttl: float, max_entries: int = 256):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.version = 0
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None or entry[0] < clock.monotonic():
+            return None
+        return entry[1]
+
+    def put(self, key, value, version: int) -> None:
+        if version != self.version:
+            return
+        self.entries[key] = (clock.monotonic() + self.ttl, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self.version += 1
+        self.entries.clear()
+
+range_cache = RangeCache(CALENDAR_CACHE_TTL)
+
+def next_bucket(day: date, bucket: str) -> date:
+    if bucket == "day":
+        return day + timedelta(days=1)
+    if bucket == "week":
+        return day + timedelta(days=7)
+    # First day of the next month, December included
+    return (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+@lru_cache(maxsize=512)
+def bucket_boundaries(start: date, end: date, tz_name: str, bucket: str) -> Tuple[tuple, tuple]:
+    """
+    Splits the local dates [start, end) of a timezone into day, week
+    (Monday first) or month buckets, widened to whole buckets.
+    Returns the local boundaries and the same instants as naive UTC,
+    which is how SQLite stores event dates.
+    """
+    tz = pytz.timezone(tz_name)
+    if bucket == "week":
+        day = start - timedelta(days=start.weekday())
+    elif bucket == "month":
+        day = start.replace(day=1)
+    else:
+        day = start
+
+    days = [day]
+    while day < end:
+        day = next_bucket(day, bucket)
+        days.append(day)
+
+    # localize, not replace(tzinfo=), so midnight gets that day's DST offset
+    local = tuple(tz.localize(datetime.combine(day, time.min)) for day in days)
+    utc = tuple(moment.astimezone(pytz.utc).replace(tzinfo=None) for moment in local)
+    return local, utc
+
+async def read_event_range(db: AsyncSession, start: date, end: date, tz_name: str, bucket: str) -> List[EventBucket]:
+    """
+    Reads the events of [start, end) in tz_name grouped into buckets,
+    served from range_cache while fresh.
+    """
+    key = (start, end, tz_name, bucket)
+    cached = range_cache.get(key)
+    if cached is not None:
+        return cached
+
+    version = range_cache.version
+    local, utc = bucket_boundaries(start, end, tz_name, bucket)
+    events = await db.scalars(select(models.EventList).where(
+        models.EventList.date >= utc[0],
+        models.EventList.date < utc[-1]
+    ).order_by(models.EventList.date, models.EventList.id))
+
+    buckets = [EventBucket(start=local[i], end=local[i + 1], events=[]) for i in range(len(local) - 1)]
+    for event in events:
+        event_date = event.date
+        if event_date.tzinfo is not None:
+            event_date = event_date.astimezone(pytz.utc).replace(tzinfo=None)
+        buckets[bisect.bisect_right(utc, event_date) - 1].events.append(EventModel.model_validate(event))
+
+    range_cache.put(key, buckets, version)
+    return buckets
+
+"""
+------------------------ PAGINATION CONFIG -------------------------
+"""
+# /calendar/ and /checklist/ page by keyset: the next page starts after the
+# last row of this one, (date, id) for events and id for tasks, so a deep
+# page is one index seek like the first. The opaque cursor of the next page
+# is sent in the X-Next-Cursor header, which keeps the list bodies as they were.
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+MAX_PAGE_SIZE = 1000
+EXPORT_BATCH_SIZE = 500
+
+def encode_cursor(values: dict) -> str:
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> dict:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(values, dict):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+def set_next_cursor(response: Response, rows: list, limit: int, cursor_of) -> list:
+    """
+    Trims rows, fetched with limit + 1, to the page and sets the next
+    cursor header when there is a row past it.
+    """
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(cursor_of(rows[-1]))
+    return rows
+
+async def export_ndjson(query, model):
+    """
+    Streams every row of query as one JSON object per line. Uses its own
+    session, the request's one is closed before a streamed body is sent.
+    """
+    async with AsyncSessionLocal() as db:
+        rows = await db.stream_scalars(query.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        async for partition in rows.partitions():
+            yield "".join(model.model_validate(row).model_dump_json() + "\n" for row in partition)
+
 """
 ------------------------ ENDPOINTS -------------------------
 """
@@ -234,62 +493,101 @@ async def create_eventlist(eventlist: EventBase, db: db_dependency):
     # model dump converts library into dictionary
     # ** is python's unpacking operator
     db_eventlist = models.EventList(**eventlist.model_dump())
+    # SQLite drops the offset of aware datetimes, store the UTC instant
+    if db_eventlist.date.tzinfo is not None:
+        db_eventlist.date = db_eventlist.date.astimezone(pytz.utc).replace(tzinfo=None)
     db.add(db_eventlist)
-    db.commit()
-    db.refresh(db_eventlist)
+    await db.commit()
+    range_cache.clear()
+    await db.refresh(db_eventlist)
     return db_eventlist
 
+@app.get("/calendar/range", response_model=List[EventBucket])
+async def read_range_eventlist(
+    db: db_dependency,
+    start: date,
+    end: Optional[date] = None,
+    tz: str = CALENDAR_TZ,
+    bucket: Literal["day", "week", "month"] = "day",
+):
+    """
+    Reads the events from local date start up to (excluding) end in
+    timezone tz, grouped into day, week or month buckets. end defaults
+    to the day after start, the range is widened to whole buckets.
+    """
+    end = end or start + timedelta(days=1)
+    if end <= start:
+        raise HTTPException(status_code=400, detail="end must be after start")
+    if (end - start).days > 3660:
+        raise HTTPException(status_code=400, detail="Range is limited to ten years")
+    if tz not in pytz.all_timezones_set:
+        raise HTTPException(status_code=400, detail=f"Unknown timezone: {tz}")
+
+    return await read_event_range(db, start, end, tz, bucket)
+
 @app.get("/calendar/today/", response_model=List[EventModel])
 async def read_today_eventlist(db: db_dependency, skip: int = 0, limit: int = 20):
     """
     Reads Today's items from the database, based on the current date
-    in the Pacific Timezone, compatible with SQLite.
+    in the calendar timezone (Pacific by default).
     """
-    pacific_tz = pytz.timezone("America/Los_Angeles")
-
-    start_of_today_pacific = datetime.now(pacific_tz).replace(hour=0, minute=0, second=0, microsecond=0)
-    start_of_tomorrow_pacific = start_of_today_pacific + timedelta(days=1)
+    today = datetime.now(pytz.timezone(CALENDAR_TZ)).date()
+    buckets = await read_event_range(db, today, today + timedelta(days=1), CALENDAR_TZ, "day")
 
-    start_of_today_utc = start_of_today_pacific.astimezone(pytz.utc)
-    start_of_tomorrow_utc = start_of_tomorrow_pacific.astimezone(pytz.utc)
-
-    eventlist = db.query(models.EventList).filter(
-        models.EventList.date >= start_of_today_utc,
-        models.EventList.date < start_of_tomorrow_utc
-    ).offset(skip).limit(limit).all()
-
-    return eventlist
+    return buckets[0].events[skip:skip + limit]
 
 @app.get("/calendar/month/", response_model=List[EventModel])
 async def read_month_eventlist(db: db_dependency, skip: int = 0, limit: int = 1000):
     """
     Reads this Month's items from the database, based on the current date
-    in the Pacific Timezone, compatible with SQLite.
+    in the calendar timezone (Pacific by default).
     """
-    pacific_tz = pytz.timezone("America/Los_Angeles")
-
-    this_month = datetime.now(pacific_tz).month
-    next_month = this_month + 1 if this_month < 13 else 1
-    start_of_month_pacific = datetime.now(pacific_tz).replace(month=this_month, minute=0, second=0, microsecond=0)
-    start_of_next_month_pacific = datetime.now(pacific_tz).replace(month=next_month, minute=0, second=0, microsecond=0)
-
-    start_of_month_utc = start_of_month_pacific.astimezone(pytz.utc)
-    start_of_next_month_utc = start_of_next_month_pacific.astimezone(pytz.utc)
+    month = datetime.now(pytz.timezone(CALENDAR_TZ)).date().replace(day=1)
+    buckets = await read_event_range(db, month, month + timedelta(days=1), CALENDAR_TZ, "month")
 
-    eventlist = db.query(models.EventList).filter(
-        models.EventList.date >= start_of_month_utc,
-        models.EventList.date < start_of_next_month_utc
-    ).offset(skip).limit(limit).all()
-
-    return eventlist
+    return buckets[0].events[skip:skip + limit]
 
 @app.get("/calendar/", response_model=List[EventModel])
-async def read_eventlist(db: db_dependency, skip: int = 0, limit: int = 100):
+async def read_eventlist(
+    db: db_dependency,
+    response: Response,
+    cursor: Optional[str] = None,
+    skip: int = 0,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+):
+    """
+    Reads up to limit (100) items from the database ordered by date.
+    Pass the X-Next-Cursor header of a page as cursor to read the next,
+    skip is only kept for older clients.
+    """
+    query = select(models.EventList).order_by(models.EventList.date, models.EventList.id)
+    if cursor is not None:
+        after = decode_cursor(cursor)
+        try:
+            after_date, after_id = datetime.fromisoformat(after["date"]), int(after["id"])
+        except (KeyError, TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        # The date >= bound is the index range, the OR only breaks ties on id
+        query = query.where(
+            models.EventList.date >= after_date,
+            or_(models.EventList.date > after_date, models.EventList.id > after_id)
+        )
+    elif skip:
+        query = query.offset(skip)
+
+    eventlist = (await db.scalars(query.limit(limit + 1))).all()
+    return set_next_cursor(
+        response, eventlist, limit,
+        lambda event: {"date": event.date.isoformat(), "id": event.id}
+    )
+
+@app.get("/calendar/export")
+async def export_eventlist():
     """
-    Reads all items up to limit (100) items from the database
+    Streams every event ordered by date as NDJSON, for bulk consumers
     """
-    eventlist = db.query(models.EventList).offset(skip).limit(limit).all()
-    return eventlist
+    query = select(models.EventList).order_by(models.EventList.date, models.EventList.id)
+    return StreamingResponse(export_ndjson(query, EventModel), media_type="application/x-ndjson")
 
 @app.delete("/calendar/clear-all")
 async def clear_all_events(db: db_dependency):
@@ -299,16 +597,17 @@ async def clear_all_events(db: db_dependency):
     """
     try:
         # Perform a bulk delete on the EventList table
-        num_rows_deleted = db.query(models.EventList).delete(synchronize_session=False)
+        result = await db.execute(delete(models.EventList))
         
         # Commit the transaction to make the changes permanent
-        db.commit()
+        await db.commit()
+        range_cache.clear()
         
         # Return a success message
-        return {"message": f"Successfully deleted {num_rows_deleted} events."}
+        return {"message": f"Successfully deleted {result.rowcount} events."}
     except Exception as e:
         # If anything goes wrong, roll back the transaction
-        db.rollback()
+        await db.rollback()
         # And raise an HTTP exception
         raise HTTPException(status_code=500, detail=f"An error occurred: {e}")
 
@@ -321,8 +620,8 @@ async def create_task(tasklist: TaskBase, db: db_dependency):
     # ** is python's unpacking operator
     db_tasklist = models.TaskList(**tasklist.model_dump())
     db.add(db_tasklist)
-    db.commit()
-    db.refresh(db_tasklist)
+    await db.commit()
+    await db.refresh(db_tasklist)
     return db_tasklist
 
 @app.patch("/checklist/{task_id}", response_model=TaskModel)
@@ -332,70 +631,170 @@ async def complete_task(task_id: int, taskUpdate: CompleteTaskBase, db: db_depen
     """
     # model dump converts library into dictionary
     # ** is python's unpacking operator
-    db_task = db.query(models.TaskList).filter(models.TaskList.id == task_id).first()
+    db_task = await db.get(models.TaskList, task_id)
     if db_task is None:
         raise HTTPException(status_code=404, detail="Task not found")
 
     setattr(db_task, 'complete', taskUpdate.complete)
 
-    db.commit()
-    db.refresh(db_task)
+    await db.commit()
+    await db.refresh(db_task)
     return db_task
 
 @app.get("/checklist/", response_model=List[TaskModel])
-async def read_tasklist(db: db_dependency, skip: int = 0, limit: int = 10):
+async def read_tasklist(
+    db: db_dependency,
+    response: Response,
+    cursor: Optional[str] = None,
+    skip: int = 0,
+    limit: int = Query(10, ge=1, le=MAX_PAGE_SIZE),
+):
+    """
+    Reads up to limit (10) items from the database ordered by id.
+    Pass the X-Next-Cursor header of a page as cursor to read the next,
+    skip is only kept for older clients.
+    """
+    query = select(models.TaskList).order_by(models.TaskList.id)
+    if cursor is not None:
+        try:
+            after_id = int(decode_cursor(cursor)["id"])
+        except (KeyError, TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        query = query.where(models.TaskList.id > after_id)
+    elif skip:
+        query = query.offset(skip)
+
+    tasklist = (await db.scalars(query.limit(limit + 1))).all()
+    return set_next_cursor(response, tasklist, limit, lambda task: {"id": task.id})
+
+@app.get("/checklist/export")
+async def export_tasklist():
+    """
+    Streams every task ordered by id as NDJSON, for bulk consumers
     """
-    Reads up to limit (10) items from the database
+    query = select(models.TaskList).order_by(models.TaskList.id)
+    return StreamingResponse(export_ndjson(query, TaskModel), media_type="application/x-ndjson")
+
+@app.get("/metrics")
+async def read_metrics():
+    """
+    Gesture latency histograms and frame/gesture counters in the
+    Prometheus text format
+    """
+    return Response(content=gesture_metrics.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/debug/preview")
+async def debug_preview(camera: int = 0):
     """
-    tasklist = db.query(models.TaskList).offset(skip).limit(limit).all()
-    return tasklist
+    Multipart MJPEG stream of a camera with the detected hands drawn on,
+    viewable in a browser. Shares the camera's gesture pipeline.
+    """
+    gesture_broadcaster = gesture_hub.get(camera)
+    preview = gesture_hub.getPreview(camera)
+    if gesture_broadcaster is None or preview is None:
+        raise HTTPException(status_code=404, detail="Preview not available")
+
+    async def preview_frames():
+        # Keeps the pipeline running like a dashboard would
+        gesture_queue = await gesture_broadcaster.subscribe(eventsOnly=True)
+        preview.watch()
+        try:
+            seq = preview.seq
+            while True:
+                while not gesture_queue.empty():
+                    if gesture_queue.get_nowait() is None:
+                        return
+                seq, jpeg = await asyncio.to_thread(preview.waitFrame, seq)
+                if jpeg is None:
+                    continue
+                yield (
+                    b"--frame\r\nContent-Type: image/jpeg\r\n"
+                    + f"Content-Length: {len(jpeg)}\r\n\r\n".encode()
+                    + jpeg
+                    + b"\r\n"
+                )
+        finally:
+            preview.unwatch()
+            await gesture_broadcaster.unsubscribe(gesture_queue)
+
+    return StreamingResponse(preview_frames(), media_type="multipart/x-mixed-replace; boundary=frame")
 
 @app.websocket("/ws")
-async def websocket_endpoint(websocket: WebSocket):
+async def websocket_endpoint(
+    websocket: WebSocket,
+    mode: Literal["stream", "events"] = "stream",
+    heartbeat: float = Query(0, ge=0),
+    camera: int = 0,
+):
     """
     Patiently waits for the front-end connection. Once 
     the front-end connects, a persistent, two-way connection
     is established between FastAPI backend and React front-end.
+
+    mode=stream sends every processed frame, mode=events only sends
+    gestures and hover start/end. heartbeat (seconds) repeats the last
+    message while the stream is quiet, 0 disables it and shorter intervals
+    than GESTURE_MIN_HEARTBEAT are raised to it. camera picks one
+    of the configured gesture sources.
+
+    Messages carry ts (capture), ts_inferred (when detection ran) and
+    ts_sent. The client may
+    reply {"ack": seq, "ts": ..., "ts_sent": ...} after acting on one,
+    which /metrics reports as send_to_ack and capture_to_ack latency.
     """
+    gesture_broadcaster = gesture_hub.get(camera)
+    if gesture_broadcaster is None:
+        await websocket.close(code=1008)
+        return
+
     await websocket.accept()
+    if heartbeat:
+        heartbeat = max(heartbeat, GESTURE_MIN_HEARTBEAT)
 
-    # start video processing
-    cap = cv.VideoCapture(0)
-    detector = htm.handDetector(minDetectionConf=0.55)
+    # every client of a camera shares one pipeline, the event loop only awaits results
+    gesture_queue = await gesture_broadcaster.subscribe(eventsOnly=(mode == "events"))
+    last_message = {'gesture': "none", 'state': "none", 'seq': 0, 'ts': 0.0}
+
+    async def receive_acks():
+        # Optional client acknowledgements, anything else is ignored
+        try:
+            while True:
+                message = await websocket.receive_text()
+                try:
+                    reply = json.loads(message)
+                    if isinstance(reply, dict) and 'ack' in reply:
+                        gesture_metrics.observeAck(camera, reply)
+                except (ValueError, TypeError):
+                    # Malformed JSON or ack, the next one may be fine
+                    continue
+        except (WebSocketDisconnect, RuntimeError):
+            return
+
+    ack_task = asyncio.create_task(receive_acks())
 
     try:
         while True:
-            
-            success, frame = cap.read()
-            if not success:
-                break
+            try:
+                message = await asyncio.wait_for(gesture_queue.get(), timeout=heartbeat or None)
+            except asyncio.TimeoutError:
+                # Low-rate keepalive, never repeats a gesture
+                message = {**last_message, 'gesture': "none", 'heartbeat': True}
+            else:
+                if message is None:
+                    # The source ended, tell the client instead of going quiet
+                    await websocket.close()
+                    break
+                last_message = message
 
-            frame = cv.flip(frame, 1)
-            frame = cv.addWeighted(frame, 1.2, np.zeros(frame.shape, frame.dtype), 0, 0)
-            lmBothList, bb = detector.find2Hands(frame)
-
-            gap_length = 50
-            if lmBothList and len(lmBothList) > 0:
-                for lmList in lmBothList:
-                    if lmList and detector.isLeft(lmList):
-                        gap_length, center_x, center_y = detector.findDistance(frame, lmList, 1, 3, False)
-                        if center_y < 160:
-                            detector.setCursorState(gap_length, center_x, center_y)
-                            break
-            
-            
-            gesture = detector.getCursorGesture()
             # Key component to send data over to the front-end
-            await websocket.send_text(json.dumps({'gesture': gesture}))
-
-            # Small delay to prevent overwhelming the client
-            await asyncio.sleep(0.02)
+            message = gesture_metrics.stampSend(camera, message)
+            await websocket.send_text(json.dumps(message))
 
     except WebSocketDisconnect:
         print("Client disconnected")
     finally:
-        cap.release()
-        print("Camera released")
+        ack_task.cancel()
+        await gesture_broadcaster.unsubscribe(gesture_queue)
 
 
 
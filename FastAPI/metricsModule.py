@@ -0,0 +1,194 @@
+import bisect
+import math
+import threading
+import time
+
+'''
+This module measures the gesture path from camera to dashboard and
+renders it in the Prometheus text exposition format for /metrics.
+It has no dependencies, a scrape just calls gestureMetrics.render().
+
+Every gesture message carries the capture time (ts), the time the
+gesture engine finished with the frame (ts_inferred, only on frames hand
+detection ran on) and, set by /ws,
+the time it was sent (ts_sent). Clients may answer a message with
+{"ack": seq, "ts": ..., "ts_sent": ...} echoing those fields once they
+acted on it, which closes the loop:
+
+    capture_to_inference  ts -> ts_inferred, capture, preprocessing and inference
+    inference_to_send     ts_inferred -> ts_sent, queues and the event loop
+    capture_to_send       ts -> ts_sent
+    send_to_ack           ts_sent -> ack received, network and client
+    capture_to_ack        ts -> ack received, glass to gesture
+'''
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.02, 0.033, 0.05, 0.075, 0.1, 0.15, 0.25, 0.5, 1.0, 2.5)
+
+
+def ackTimestamp(ack, key):
+    """
+    Reads an optional timestamp of a client acknowledgement.
+
+    :return: Float seconds, or None when ack has no key
+    """
+    if key not in ack:
+        return None
+    value = ack[key]
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+        raise ValueError(f"ack {key} must be a finite number, got {value!r}")
+    return float(value)
+
+
+def formatLabels(names, values) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{value}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class counter:
+    """
+    Monotonic counter with labels.
+    """
+
+    def __init__(self, name, description, labels=()):
+        self.name = name
+        self.description = description
+        self.labels = labels
+        self.values = {}
+
+    def inc(self, *labelValues, amount=1) -> None:
+        self.values[labelValues] = self.values.get(labelValues, 0) + amount
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} counter"]
+        for labelValues, value in sorted(self.values.items()):
+            lines.append(f"{self.name}{formatLabels(self.labels, labelValues)} {value}")
+        return lines
+
+
+class histogram:
+    """
+    Histogram with fixed buckets and labels.
+    """
+
+    def __init__(self, name, description, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.description = description
+        self.labels = labels
+        self.buckets = tuple(buckets)
+        # label values -> [per-bucket counts (last one is +Inf), sum, count]
+        self.values = {}
+
+    def observe(self, value, *labelValues) -> None:
+        series = self.values.get(labelValues)
+        if series is None:
+            series = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            self.values[labelValues] = series
+        series[0][bisect.bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} histogram"]
+        names = (*self.labels, "le")
+        for labelValues, (counts, total, count) in sorted(self.values.items()):
+            cumulative = 0
+            for bound, bucketCount in zip((*self.buckets, "+Inf"), counts):
+                cumulative += bucketCount
+                lines.append(f"{self.name}_bucket{formatLabels(names, (*labelValues, bound))} {cumulative}")
+            lines.append(f"{self.name}_sum{formatLabels(self.labels, labelValues)} {total:.6f}")
+            lines.append(f"{self.name}_count{formatLabels(self.labels, labelValues)} {count}")
+        return lines
+
+
+class gestureMetrics:
+    """
+    Latency and throughput metrics of every camera's gesture pipeline.
+    Observed from the event loop, rendered from any thread.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latency = histogram(
+            "gesture_latency_seconds",
+            "Latency of each stage of the gesture path",
+            ("camera", "stage"),
+        )
+        self.framesProcessed = counter(
+            "gesture_frames_processed_total", "Frames run through the gesture pipeline", ("camera",)
+        )
+        self.framesDropped = counter(
+            "gesture_frames_dropped_total", "Stale frames skipped before inference", ("camera",)
+        )
+        self.gesturesEmitted = counter(
+            "gesture_gestures_emitted_total", "Gestures recognized", ("camera", "gesture")
+        )
+        self.acks = counter("gesture_acks_total", "Gesture messages acknowledged by clients", ("camera",))
+        # Dropped counts arrive as running totals per pipeline run
+        self.lastDropped = {}
+
+    def observeMessage(self, camera, message) -> None:
+        """
+        Records one pipeline message, once no matter how many clients get it.
+        """
+        with self.lock:
+            self.framesProcessed.inc(camera)
+
+            dropped = message.get('dropped', 0)
+            previous = self.lastDropped.get(camera, 0)
+            # A restarted pipeline starts counting from 0 again
+            self.framesDropped.inc(camera, amount=dropped - previous if dropped >= previous else dropped)
+            self.lastDropped[camera] = dropped
+
+            if message['gesture'] != "none":
+                self.gesturesEmitted.inc(camera, message['gesture'])
+            for event in message.get('events', ()):
+                self.gesturesEmitted.inc(camera, event['gesture'])
+
+            if 'ts_inferred' in message:
+                self.latency.observe(message['ts_inferred'] - message['ts'], camera, "capture_to_inference")
+
+    def stampSend(self, camera, message) -> dict:
+        """
+        Stamps a message about to be sent with ts_sent and records it.
+        Heartbeats repeat an old message and are not recorded.
+
+        :return: Dictionary, a copy of message
+        """
+        message = {**message, 'ts_sent': time.time()}
+        if message.get('heartbeat'):
+            return message
+
+        with self.lock:
+            self.latency.observe(message['ts_sent'] - message['ts'], camera, "capture_to_send")
+            if 'ts_inferred' in message:
+                self.latency.observe(message['ts_sent'] - message['ts_inferred'], camera, "inference_to_send")
+        return message
+
+    def observeAck(self, camera, ack, received=None) -> None:
+        """
+        Records a client acknowledgement echoing ts and ts_sent. Nothing
+        is recorded unless both, where present, are finite numbers.
+
+        :raises: ValueError, for a malformed acknowledgement
+        """
+        received = received or time.time()
+        sent = ackTimestamp(ack, 'ts_sent')
+        captured = ackTimestamp(ack, 'ts')
+        with self.lock:
+            self.acks.inc(camera)
+            if sent is not None:
+                self.latency.observe(received - sent, camera, "send_to_ack")
+            if captured is not None:
+                self.latency.observe(received - captured, camera, "capture_to_ack")
+
+    def render(self) -> str:
+        """
+        :return: String in the Prometheus text exposition format
+        """
+        with self.lock:
+            lines = []
+            for metric in (self.latency, self.framesProcessed, self.framesDropped, self.gesturesEmitted, self.acks):
+                lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
@@ -55,7 +55,12 @@ class EventList(Base):
     title= Column(String(100))
     desc = Column(String(255))
     link = Column(String(255))
-    date = Column(DateTime(timezone=True), nullable=False)
+    # Range queries of the calendar views. SQLite ends every index entry
+    # with the rowid (id), so this also orders by (date, id).
+    date = Column(DateTime(timezone=True), nullable=False, index=True)
+
+    # Once events have an owner, scope the range index by it:
+    # __table_args__ = (Index("ix_eventlist_owner_id_date", "owner_id", "date"),)
     
 # class NoteList(Base):
 #     __tablename__ = 'notelist'
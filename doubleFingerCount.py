@@ -97,7 +97,7 @@ def main():
 
     while True:
         success, frame = cap.read()
-        frame = detector.findHands(frame)
+        frame = detector.drawHands(frame)
 
         '''
         The order of the landmark list is unspecified. Note:
@@ -46,7 +46,7 @@ pTime = 0
 while True:
     success, frame = cap.read()
 
-    frame = detector.findHands(frame)
+    frame = detector.drawHands(frame)
     lmList = detector.findHandLocations(frame, draw=False)
 
     if lmList and len(lmList) > 0:
@@ -63,8 +63,17 @@ const Dashboard = () => {
   // CHECKLIST -------------------------------------
   const fetchTasklist = async () => {
     try {
-      const response = await api.get("/checklist/");
-      setTasklist(response.data);
+      // Pages are keyset cursors, follow X-Next-Cursor until the last page
+      let tasks = [];
+      let cursor = null;
+      do {
+        const response = await api.get("/checklist/", {
+          params: cursor ? { limit: 100, cursor } : { limit: 100 },
+        });
+        tasks = tasks.concat(response.data);
+        cursor = response.headers["x-next-cursor"];
+      } while (cursor);
+      setTasklist(tasks);
     } catch (error) {
       console.error("Failed to fetch tasklist:", error);
     }
@@ -206,7 +215,7 @@ const Dashboard = () => {
   // Establish Hand Gesture Detector WS
   useEffect(() => {
     // Key component used by front end to connect
-    const ws = new WebSocket("ws://localhost:8000/ws");
+    const ws = new WebSocket("ws://localhost:8000/ws?mode=events&heartbeat=5");
 
     ws.onopen = () => {
       console.log("WebSocket connection established");
@@ -215,6 +224,10 @@ const Dashboard = () => {
     ws.onmessage = (event) => {
       const data = JSON.parse(event.data);
       setGesture(data.gesture);
+      // Acknowledge real gestures so /metrics can report glass-to-gesture latency
+      if (data.gesture !== "none" && ws.readyState === WebSocket.OPEN) {
+        ws.send(JSON.stringify({ ack: data.seq, ts: data.ts, ts_sent: data.ts_sent }));
+      }
     };
 
     ws.onclose = () => {
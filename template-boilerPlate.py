@@ -16,7 +16,7 @@ while True:
     if not success:
         break
 
-    frame = detector.findHands(frame)
+    frame = detector.drawHands(frame)
     lmList = detector.findHandLocations(frame)
 
     cTime = time.time()